@@ -19,4 +19,7 @@ __version__ = "1.3"
 __license__ = "Apache"
 __copyright__ = "Copyright 2016 Real-Time Innovations, Inc."
 # pylint: disable=E0603
-__all__ = ("devices", "countset", "logger", "logparser", "logs", "utils")
+__all__ = ("devices", "checkpoint", "clockdecoder", "countset",
+           "eventstream", "logger", "logparser", "logs", "obfuscator",
+           "packetstats", "parallel", "pipeline", "rangeset", "rateseries",
+           "state", "timeindex", "utils")
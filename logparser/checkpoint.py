@@ -0,0 +1,130 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Checkpoint of the parser state.
+
+A checkpoint saves the parser state and the offset of the input file that
+has been parsed, so a later run can resume from that point when the log
+grows. The bytes just before the offset are saved too, to check that the
+input file is the same. The checkpoint is a zlib-compressed pickle.
+
+Functions:
+  + save_checkpoint: Save the parser state into a checkpoint file.
+  + load_checkpoint: Load the parser state from a checkpoint file.
+  + get_fingerprint: Get the fingerprint of the input file at an offset.
+
+Constants:
+  + CHECKPOINT_VERSION: Version of the checkpoint format.
+  + FINGERPRINT_SIZE: Number of bytes before the offset to check.
+  + EXCLUDED_KEYS: State keys that depend on the current run.
+"""
+from __future__ import absolute_import
+from hashlib import sha1
+from os import remove
+from os.path import exists
+from zlib import compress, decompress
+
+from logparser.devices.inputdevices import get_compression, open_compressed
+
+try:
+    import cPickle as pickle  # Python 2.7
+except ImportError:
+    import pickle  # Python 3.x
+
+try:
+    from os import replace  # Python 3.x
+except ImportError:
+    from os import rename as replace  # Python 2.7
+
+CHECKPOINT_VERSION = 6
+FINGERPRINT_SIZE = 4096
+EXCLUDED_KEYS = frozenset([
+    'input_device', 'output_device', 'format_device', 'clock_decoder',
+    'input_file', 'jobs', 'output_line', 'no_timestamp', 'obfuscate',
+    'assign_names', 'no_stats', 'show_progress', 'show_lines',
+    'write_original', 'debug', 'verbosity', 'guid_names', 'obfuscator',
+    'rate_interval', 'rate_buckets'])
+
+
+def save_checkpoint(file_path, state, offset):
+    """Save the parser state into a checkpoint file.
+
+    The file is replaced only after the new checkpoint is written.
+    """
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'offset': offset,
+        'fingerprint': get_fingerprint(state.input_file, offset),
+        'rate': (state.rate_interval, state.rate_buckets),
+        'state': dict((key, value) for key, value in state.items()
+                      if key not in EXCLUDED_KEYS)
+    }
+    data = compress(pickle.dumps(checkpoint, pickle.HIGHEST_PROTOCOL))
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as stream:
+            stream.write(data)
+        replace(tmp_path, file_path)
+    except (IOError, OSError):
+        if exists(tmp_path):
+            remove(tmp_path)
+        raise
+
+
+def load_checkpoint(file_path, state):
+    """Load the parser state from a checkpoint file.
+
+    The state is updated only if the checkpoint matches the input file.
+    The bandwidth time series are not restored if they have different
+    intervals than the current options.
+
+    Returns:
+        The offset of the input file to resume from, or None if the
+        checkpoint doesn't match the input file.
+    """
+    with open(file_path, "rb") as stream:
+        checkpoint = pickle.loads(decompress(stream.read()))
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+
+    offset = checkpoint['offset']
+    fingerprint = get_fingerprint(state.input_file, offset)
+    if fingerprint is None or fingerprint != checkpoint['fingerprint']:
+        return None
+    values = checkpoint['state']
+    if checkpoint.get('rate') != (state.rate_interval, state.rate_buckets):
+        values.pop('statistics_rate', None)
+    state.update(values)
+    return offset
+
+
+def get_fingerprint(file_path, offset):
+    """Get the fingerprint of the input file at an offset.
+
+    Returns:
+        The digest of the bytes before the offset, or None if the file is
+        shorter than the offset.
+    """
+    start = max(0, offset - FINGERPRINT_SIZE)
+    compression = get_compression(file_path)
+    with open(file_path, "rb") as file_stream:
+        stream = file_stream
+        if compression:
+            stream = open_compressed(file_stream, compression)
+        stream.seek(start)
+        data = stream.read(offset - start)
+    if len(data) != offset - start:
+        return None
+    return sha1(data).hexdigest()
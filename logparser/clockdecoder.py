@@ -0,0 +1,131 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Clock decoder.
+
+The module contains the ClockDecoder class.
+"""
+from __future__ import absolute_import
+import re
+from calendar import timegm
+from datetime import datetime, timedelta
+
+DATE_REGEX = re.compile(r'\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}).(\d{6})\]' +
+                        r'\[(\d{10})\.(\d{6})\]')
+SINGLE_DATE_REGEX = re.compile(r'\[(\d{10})\.(\d{6})\]')
+CLOCKS_BYTES_REGEX = re.compile(br'\[\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}.' +
+                                br'\d{6}\]\[\d{10}\.\d{6}\]|' +
+                                br'\[\d{10}\.\d{6}\]')
+EPOCH = datetime(1970, 1, 1)
+TIME_FORMATS = ("%m/%d/%Y %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S",
+                "%m/%d/%Y", "%Y-%m-%d")
+
+
+class ClockDecoder(object):
+    """Decode the log clocks into integer microseconds.
+
+    The clocks are a tuple with the monotonic and the system clock. The
+    monotonic clock is None if the log only has one clock. The system clock
+    of the two clocks format is decoded as if it were UTC.
+
+    Functions:
+      + decode: get the clocks of a log line.
+      + find_clocks: find the clocks in a raw log line.
+      + get_datetime: convert a system clock into a datetime object.
+      + get_isoformat: convert a system clock into ISO 8601 format.
+      + parse_time: convert a time from the user into a system clock.
+    """
+
+    def __init__(self):
+        """Constructor of the class."""
+        self._last_date = None
+        self._last_date_secs = 0
+        self._last_system = None
+        self._last_isoformat = None
+
+    def decode(self, line):
+        """Get the clocks of a log line.
+
+        Returns:
+            A tuple with the monotonic and system clocks in microseconds or
+            None if the line doesn't have clocks.
+        """
+        if '[' not in line:
+            return None
+
+        # Try to match the two clock format.
+        clocks = DATE_REGEX.search(line)
+        if clocks:
+            date, micros, mono_secs, mono_micros = clocks.groups()
+            # Parse the date only when the second changes.
+            if date != self._last_date:
+                system = datetime.strptime(date, "%m/%d/%Y %H:%M:%S")
+                self._last_date_secs = timegm(system.timetuple())
+                self._last_date = date
+            system = self._last_date_secs * 1000000 + int(micros)
+            monotonic = int(mono_secs) * 1000000 + int(mono_micros)
+            return (monotonic, system)
+
+        # If it doesn't match, try with the single clock format.
+        clocks = SINGLE_DATE_REGEX.search(line)
+        if clocks:
+            system = int(clocks.group(1)) * 1000000 + int(clocks.group(2))
+            return (None, system)
+        return None
+
+    @staticmethod
+    def find_clocks(buff, start, end):
+        """Find the clocks in a raw log line.
+
+        Returns:
+            The start and end offsets of the clocks in the bytes-like buffer
+            or None if the line doesn't have clocks.
+        """
+        clocks = CLOCKS_BYTES_REGEX.search(buff, start, end)
+        return clocks.span() if clocks else None
+
+    @staticmethod
+    def get_datetime(system):
+        """Convert a system clock into a datetime object."""
+        return EPOCH + timedelta(microseconds=system)
+
+    def get_isoformat(self, system):
+        """Convert a system clock into ISO 8601 format."""
+        if system != self._last_system:
+            self._last_isoformat = self.get_datetime(system).isoformat()
+            self._last_system = system
+        return self._last_isoformat
+
+    @staticmethod
+    def parse_time(text):
+        """Convert a time from the user into a system clock.
+
+        The time is a date in the format of the logs or ISO 8601 with
+        optional microseconds, or the seconds of the single clock format.
+        """
+        try:
+            return int(round(float(text) * 1000000))
+        except ValueError:
+            pass
+
+        date, _, micros = text.partition(".")
+        micros = int((micros + "000000")[:6]) if micros else 0
+        for time_format in TIME_FORMATS:
+            try:
+                system = datetime.strptime(date, time_format)
+            except ValueError:
+                continue
+            return timegm(system.timetuple()) * 1000000 + micros
+        raise ValueError("Invalid time: %s" % text)
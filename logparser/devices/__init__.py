@@ -16,5 +16,6 @@
 """Module to manage the I/O devices and some predefined devices."""
 
 # pylint: disable=E0603
-__all__ = ("formatdevice", "inputdevices",
-           "markdownformatdevice", "outputdevices")
+__all__ = ("eventformatdevice", "formatdevice", "inputdevices",
+           "jsonformatdevice", "markdownformatdevice", "outputdevices",
+           "sqliteformatdevice")
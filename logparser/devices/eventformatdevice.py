@@ -0,0 +1,112 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Format device that keeps the messages as event records.
+
+Classes:
+  + LogEvent: Record of a parsed log message.
+  + EventFormatDevice: Format device that keeps the messages as records.
+
+Functions:
+  + get_event_kind: Get the kind of event of a message.
+
+Constants:
+  + EVENT_KINDS: Kinds of the log events.
+"""
+from __future__ import absolute_import
+from collections import deque, namedtuple
+
+from logparser.devices.formatdevice import FormatDevice
+from logparser.logger import KIND_ERROR, KIND_WARNING
+
+EVENT_KINDS = ('packet', 'event', 'warning', 'error')
+
+
+def get_event_kind(message):
+    """Get the kind of event of a message."""
+    if message.kind & KIND_ERROR:
+        return 'error'
+    elif message.kind & KIND_WARNING:
+        return 'warning'
+    elif message.remote is not None:
+        return 'packet'
+    return 'event'
+
+
+class LogEvent(namedtuple('LogEvent', ['kind', 'direction', 'remote',
+                                       'entity', 'description', 'timestamp',
+                                       'line'])):
+    """Record of a parsed log message.
+
+    Attributes:
+        kind (str): one of EVENT_KINDS.
+        direction (str): 'in' or 'out' for sent and received packets.
+        remote (str): remote address of a packet, None otherwise.
+        entity (str): local entity of a packet, None otherwise.
+        description (str): description of the message.
+        timestamp (int): system clock in microseconds of the log, or None.
+        line (int): line of the input log.
+    """
+
+    __slots__ = ()
+
+
+class EventFormatDevice(FormatDevice):
+    """Format device that keeps the messages as records.
+
+    The messages are not formatted. They are queued as LogEvent records in
+    the events attribute until the consumer takes them. The summary is not
+    written since it's available in the parser state.
+
+    Functions:
+      + write_header: nothing to write.
+      + write_message: queue the message as a LogEvent.
+      + write_configurations: nothing to write.
+      + write_warnings: nothing to write.
+      + write_errors: nothing to write.
+    """
+
+    def __init__(self, kinds=None):
+        """Initialize the device with the kinds of events to keep."""
+        self.kinds = frozenset(EVENT_KINDS if kinds is None else kinds)
+        self.events = deque()
+
+    def write_header(self, state):
+        """Nothing to write."""
+        pass
+
+    def write_message(self, message, state):
+        """Queue the message as a LogEvent."""
+        kind = get_event_kind(message)
+        if kind not in self.kinds:
+            return
+
+        clocks = state.clocks
+        self.events.append(LogEvent(
+            kind, message.inout, message.remote, message.entity,
+            message.description, clocks[1] if clocks else None,
+            message.input_line))
+
+    def write_configurations(self, state):
+        """Nothing to write."""
+        pass
+
+    def write_warnings(self, state):
+        """Nothing to write."""
+        pass
+
+    def write_errors(self, state):
+        """Nothing to write."""
+        pass
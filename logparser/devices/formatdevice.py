@@ -31,18 +31,21 @@ class FormatDevice(object):
       + write_configurations: write the configuration messages.
       + write_warnings: write the warning messages.
       + write_errors: write the error messages.
+
+    Optionally, you can implement the following methods:
+      + close: finish writing the output.
     """
 
     def write_header(self, state):
         """Write the header if any."""
         raise NotImplementedError("write_header not implemented")
 
-    def write_message(self, content, state):
+    def write_message(self, message, state):
         """Write the message.
 
-        The content argument is a dictionary with at least 'description' item.
-        The optional items are:
-          + kind: the kind or remark for the message.
+        The message argument is a LogMessage record with the description.
+        The optional fields are None if they don't apply:
+          + kind: bitmask of the kind or remark for the message (0 if none).
           + timestamp: the timestamp of the message.
           + input_line: the current input line.
           + output_line: the current output line.
@@ -63,3 +66,7 @@ class FormatDevice(object):
     def write_errors(self, state):
         """Write the error messages."""
         raise NotImplementedError("write_errors not implemented")
+
+    def close(self):
+        """Finish writing the output after the summary."""
+        pass
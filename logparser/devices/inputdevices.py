@@ -21,11 +21,62 @@ Classes:
   + InputDevice: Abstract base class for input device implementations
   + InputConsoleDevice: Reads the DDS log messages from the standard input.
   + InputFileDevice: Reads the DDS log messages from a file.
+  + InputBlockFileDevice: Reads the DDS log messages from a file by blocks.
+  + InputMmapFileDevice: Reads the DDS log messages from a memory-mapped file.
+  + InputMergeDevice: Reads the DDS log messages from several files by time.
+
+Functions:
+  + get_compression: Get the compression format of a file.
+  + open_compressed: Open a binary stream that decompress the given one.
+
+Constants:
+  + COMPRESSION_MAGIC: Magic numbers of the supported compression formats.
 """
 from __future__ import absolute_import, print_function
-from os import fstat
+from bz2 import BZ2File
+from gzip import GzipFile
+from heapq import merge
+from mmap import ACCESS_READ, mmap
+from os import fstat, stat
 from sys import stdin, stdout
-from time import time
+from time import sleep, time
+
+from logparser.clockdecoder import ClockDecoder
+
+try:
+    from lzma import LZMAFile  # Python 3.x
+except ImportError:
+    LZMAFile = None
+
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bzip2": b"BZh",
+    "xz": b"\xfd7zXZ\x00"}
+
+
+def get_compression(file_path):
+    """Get the compression format of a file.
+
+    Returns:
+        The name of the compression format or None if it isn't compressed.
+    """
+    with open(file_path, "rb") as stream:
+        header = stream.read(6)
+    for name, magic in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def open_compressed(stream, compression):
+    """Open a binary stream that decompress the given one."""
+    if compression == "gzip":
+        return GzipFile(fileobj=stream, mode="rb")
+    elif compression == "bzip2":
+        return BZ2File(stream)
+    elif compression == "xz" and LZMAFile is not None:
+        return LZMAFile(stream)
+    raise IOError("Compression format %s is not supported" % compression)
 
 
 class InputDevice(object):
@@ -34,11 +85,18 @@ class InputDevice(object):
     You will need to implement the following methods:
         + read_line: Read and return the next DDS log message from the device.
         + close: Close the device.
+
+    Optionally, you can implement the following methods:
+        + read_lines: Read and return the next DDS log messages as a list.
+        + get_position: Get the position in the input if it's known.
+        + print_status: Print the progress status of the device.
     """
 
     def __init__(self, state):
         """Initialize the device."""
-        self.show_progress = state['show_progress']
+        self.show_progress = state.show_progress
+        # Additional information to show in the progress line.
+        self.progress_info = ""
 
     def read_line(self):
         """Read and return the next DDS log message from the device.
@@ -47,6 +105,26 @@ class InputDevice(object):
         """
         raise NotImplementedError("read_line not implemented")
 
+    def read_lines(self):
+        """Read and return the next DDS log messages as a list.
+
+        It must return None on EOF. By default, it returns the next line.
+        """
+        line = self.read_line()
+        return None if line is None else [line]
+
+    def get_position(self):
+        """Get the position in the input if it's known, None otherwise."""
+        return None
+
+    def print_status(self, position=None):
+        """Print the progress status of the device.
+
+        The position is a value returned by get_position, by default the
+        current position.
+        """
+        pass
+
     def close(self):
         """Close the device."""
         raise NotImplementedError("close not implemented")
@@ -57,6 +135,7 @@ class InputConsoleDevice(InputDevice):
 
     Functions:
       + print_time: Print the execution time.
+      + print_status: Print the execution time.
       + read_line: Read and return the next DDS log message from the device.
       + close: Close the file stream.
     """
@@ -76,9 +155,14 @@ class InputConsoleDevice(InputDevice):
 
         self.current_time = current_time
         diff_time = current_time - self.start_time
-        stdout.write("Running for %.2f sec\r" % diff_time)
+        stdout.write("Running for %.2f sec%s\r" % (diff_time,
+                                                    self.progress_info))
         stdout.flush()
 
+    def print_status(self, position=None):
+        """Print the execution time."""
+        self.print_time(0.2)
+
     def read_line(self):
         """Read and return the next DDS log message from the device.
 
@@ -95,7 +179,7 @@ class InputConsoleDevice(InputDevice):
             print("[InputError] %s" % ex)
 
         if self.show_progress:
-            self.print_time(0.2)
+            self.print_status()
         return line
 
     def close(self):
@@ -108,7 +192,9 @@ class InputFileDevice(InputDevice):
 
     Functions:
       + __init__: Initialize the device with the specified file path.
+      + get_position: Get the number of bytes read from the file.
       + print_progress: Print a terminal progress bar.
+      + print_status: Print a terminal progress bar.
       + read_line: Read and return the next DDS log message from the device.
       + close: Close the file stream.
     """
@@ -120,10 +206,20 @@ class InputFileDevice(InputDevice):
         self.file_size = fstat(self.stream.fileno()).st_size
         self.progress = -1
 
-    def print_progress(self, threshold=0, decimals=1, barLength=100):
-        """Print a terminal progress bar."""
+    def get_position(self):
+        """Get the number of bytes read from the file."""
+        return self.stream.tell()
+
+    def print_progress(self, threshold=0, decimals=1, barLength=100,
+                       iteration=None):
+        """Print a terminal progress bar.
+
+        The progress is given by the iteration argument if it's set or the
+        number of bytes read from the file otherwise.
+        """
         # Based on @Greenstick's reply (https://stackoverflow.com/a/34325723)
-        iteration = self.stream.tell()
+        if iteration is None:
+            iteration = self.get_position()
         if iteration > self.file_size:
             return
         total = self.file_size
@@ -139,9 +235,14 @@ class InputFileDevice(InputDevice):
         filledLength = int(round(barLength * iteration / float(total)))
 
         barText = '*' * filledLength + '-' * (barLength - filledLength)
-        stdout.write('%s| %s%% Completed\r' % (barText, percents))
+        stdout.write('%s| %s%% Completed%s\r' % (barText, percents,
+                                                  self.progress_info))
         stdout.flush()
 
+    def print_status(self, position=None):
+        """Print a terminal progress bar."""
+        self.print_progress(0.01, 2, 51, position)
+
     def read_line(self):
         """Read and return the next DDS log message from the device.
 
@@ -158,9 +259,375 @@ class InputFileDevice(InputDevice):
             print("[InputError] %s" % ex)
 
         if self.show_progress:
-            self.print_progress(0.01, 2, 51)
+            self.print_status()
         return line
 
     def close(self):
         """Close the device."""
         self.stream.close()
+
+
+class InputBlockFileDevice(InputFileDevice):
+    """Input file device. Reads the DDS log messages from a file by blocks.
+
+    The file is read in large binary blocks that are decoded and split into
+    lines at once. Invalid characters are replaced instead of failing. The
+    progress bar is updated once per block.
+
+    Files compressed with gzip, bzip2 or xz are decompressed while reading.
+    In that case, the progress is given by the compressed bytes read.
+
+    In follow mode, the device waits for new data at the end of the file
+    instead of returning EOF. The file is polled with exponential backoff.
+    If the file is truncated it's read again from the start, and if it's
+    rotated (replaced by a new file) the new file is opened. Set follow to
+    False to read until the end of the file and stop.
+
+    Functions:
+      + __init__: Initialize the device with the specified file path.
+      + get_position: Get the number of bytes read from the file.
+      + get_offset: Get the offset of the data returned as lines.
+      + set_offset: Continue reading the file from an offset.
+      + read_lines: Read and return the next DDS log messages as a list.
+      + read_line: Read and return the next DDS log message from the device.
+      + close: Close the file streams.
+    """
+
+    BLOCK_SIZE = 1 << 20
+    MIN_POLL_TIME = 0.05
+    MAX_POLL_TIME = 2.0
+
+    def __init__(self, file_path, state, encoding="utf-8", follow=False):
+        """Initialize the device with the specified file path."""
+        # pylint: disable=W0233
+        InputDevice.__init__(self, state)
+        self.file_path = file_path
+        self.follow = follow
+        self.file_stream = open(file_path, "rb")
+        self.file_size = fstat(self.file_stream.fileno()).st_size
+        compression = get_compression(file_path)
+        if compression:
+            self.stream = open_compressed(self.file_stream, compression)
+        else:
+            self.stream = self.file_stream
+        self.progress = -1
+        self.encoding = encoding
+        self._remainder = b""
+        self._lines = []
+
+    def read_lines(self):
+        """Read and return the next DDS log messages as a list.
+
+        The lines don't contain the end of line characters.
+        Return None on EOF.
+        """
+        poll_time = self.MIN_POLL_TIME
+        while True:
+            block = self.stream.read(self.BLOCK_SIZE)
+
+            # In follow mode wait until there is new data.
+            if not block and self.follow:
+                if not self._check_file():
+                    sleep(poll_time)
+                    poll_time = min(2 * poll_time, self.MAX_POLL_TIME)
+                continue
+            poll_time = self.MIN_POLL_TIME
+
+            # On EOF return the last line if it didn't have end of line.
+            if not block:
+                if not self._remainder:
+                    return None
+                block, self._remainder = self._remainder, b""
+                return [block.decode(self.encoding, "replace")]
+
+            # Split by the last end of line so we don't break any character.
+            end = block.rfind(b"\n")
+            if end == -1:
+                self._remainder += block
+                continue
+            block, self._remainder = \
+                self._remainder + block[:end], block[end + 1:]
+
+            if self.show_progress:
+                self.print_status()
+            return block.decode(self.encoding, "replace").split("\n")
+
+    def read_line(self):
+        """Read and return the next DDS log message from the device.
+
+        Return None on EOF.
+        """
+        if not self._lines:
+            self._lines = self.read_lines()
+            if self._lines is None:
+                self._lines = []
+                return None
+            self._lines.reverse()
+        return self._lines.pop() + "\n"
+
+    def _check_file(self):
+        """Check if the file has been truncated or rotated.
+
+        Returns:
+            True if the file must be read again, False otherwise.
+        """
+        try:
+            info = stat(self.file_path)
+        except OSError:
+            # The file may be removed while rotating.
+            return False
+
+        current_info = fstat(self.file_stream.fileno())
+        if (info.st_dev, info.st_ino) != (current_info.st_dev,
+                                          current_info.st_ino):
+            self.stream.close()
+            self.file_stream.close()
+            self.file_stream = open(self.file_path, "rb")
+            self.stream = self.file_stream
+        elif info.st_size < self.file_stream.tell():
+            self.file_stream.seek(0)
+        else:
+            self.file_size = info.st_size
+            return False
+
+        # The last line of the previous content is complete.
+        if self._remainder:
+            self._remainder += b"\n"
+        self.file_size = info.st_size
+        self.progress = -1
+        return True
+
+    def get_position(self):
+        """Get the number of bytes read from the file."""
+        return self.file_stream.tell()
+
+    def get_offset(self):
+        """Get the offset of the data returned as lines.
+
+        For compressed files, it's the offset in the decompressed data.
+        """
+        return self.stream.tell() - len(self._remainder)
+
+    def set_offset(self, offset):
+        """Continue reading the file from an offset.
+
+        For compressed files, it's the offset in the decompressed data.
+        """
+        self.stream.seek(offset)
+        self._remainder = b""
+        self._lines = []
+
+    def close(self):
+        """Close the file streams."""
+        self.stream.close()
+        self.file_stream.close()
+
+
+class InputMmapFileDevice(InputFileDevice):
+    """Input file device. Reads the DDS log messages from a memory-mapped file.
+
+    The lines are not copied from the mapped memory unless they are needed.
+    If a prefilter function is set, it's called with the mapped buffer and
+    the start and end offsets of each line. It returns the start and end
+    offsets of the part of the line to decode, or None to skip the line.
+    The skipped lines are returned as empty lines, so the line count is
+    still right.
+
+    Functions:
+      + __init__: Initialize the device with the specified file path.
+      + get_position: Get the number of bytes read from the file.
+      + get_offset: Get the offset of the data returned as lines.
+      + set_offset: Continue reading the file from an offset.
+      + read_lines: Read and return the next DDS log messages as a list.
+      + read_line: Read and return the next DDS log message from the device.
+      + close: Close the memory map and the file stream.
+    """
+
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, file_path, state, encoding="utf-8"):
+        """Initialize the device with the specified file path."""
+        # pylint: disable=W0233
+        InputDevice.__init__(self, state)
+        self.stream = open(file_path, "rb")
+        self.file_size = fstat(self.stream.fileno()).st_size
+        self.progress = -1
+        self.encoding = encoding
+        self.prefilter = None
+        self.offset = 0
+        self._lines = []
+        # It's not possible to map an empty file.
+        self.buffer = None
+        if self.file_size > 0:
+            self.buffer = mmap(self.stream.fileno(), 0, access=ACCESS_READ)
+
+    def get_position(self):
+        """Get the number of bytes read from the file."""
+        return self.offset
+
+    def get_offset(self):
+        """Get the offset of the data returned as lines."""
+        return self.offset
+
+    def set_offset(self, offset):
+        """Continue reading the file from an offset."""
+        self.offset = offset
+        self._lines = []
+
+    def read_lines(self):
+        """Read and return the next DDS log messages as a list.
+
+        The lines don't contain the end of line characters.
+        Return None on EOF.
+        """
+        start = self.offset
+        if start >= self.file_size:
+            return None
+
+        # Get the next block of lines ending in an end of line.
+        end = self.buffer.find(b"\n", min(start + self.BLOCK_SIZE,
+                                          self.file_size - 1))
+        end = self.file_size if end == -1 else end + 1
+        self.offset = end
+
+        if self.prefilter is None:
+            lines = self.buffer[start:end].decode(self.encoding, "replace")
+            lines = lines.split("\n")
+            if lines[-1] == "":
+                lines.pop()
+        else:
+            lines = []
+            prefilter = self.prefilter
+            while start < end:
+                line_end = self.buffer.find(b"\n", start, end)
+                if line_end == -1:
+                    line_end = end
+                span = prefilter(self.buffer, start, line_end)
+                if span is not None:
+                    lines.append(self.buffer[span[0]:span[1]].decode(
+                        self.encoding, "replace"))
+                else:
+                    lines.append("")
+                start = line_end + 1
+
+        if self.show_progress:
+            self.print_status()
+        return lines
+
+    def read_line(self):
+        """Read and return the next DDS log message from the device.
+
+        Return None on EOF.
+        """
+        if not self._lines:
+            self._lines = self.read_lines()
+            if self._lines is None:
+                self._lines = []
+                return None
+            self._lines.reverse()
+        return self._lines.pop() + "\n"
+
+    def close(self):
+        """Close the memory map and the file stream."""
+        if self.buffer is not None:
+            self.buffer.close()
+        self.stream.close()
+
+
+class InputMergeDevice(InputFileDevice):
+    """Input merge device. Reads the DDS log messages from several files.
+
+    The messages of the files are merged by their system clock, using the
+    monotonic clock to break ties. The lines without clocks are kept after
+    the previous line of the same file, so multi-line messages are not
+    split. Each file is read by blocks, so the memory doesn't depend on the
+    size of the files. The progress is given by the bytes read from all
+    the files.
+
+    Functions:
+      + __init__: Initialize the device with the specified input devices.
+      + get_position: Get the number of bytes read from the files.
+      + read_lines: Read and return the next DDS log messages as a list.
+      + read_line: Read and return the next DDS log message from the device.
+      + close: Close the input devices.
+    """
+
+    BATCH_SIZE = 4096
+
+    def __init__(self, devices, state):
+        """Initialize the device with the specified input devices."""
+        # pylint: disable=W0233
+        InputDevice.__init__(self, state)
+        self.devices = devices
+        self.file_size = 0
+        for device in devices:
+            # The progress of the files is printed by this device.
+            device.show_progress = False
+            self.file_size += device.file_size
+        self.progress = -1
+        self._records = merge(*[self._read_records(index, device)
+                                for index, device in enumerate(devices)])
+        self._lines = []
+
+    @staticmethod
+    def _read_records(index, device):
+        """Read the messages of a device with their sort keys.
+
+        Returns:
+            A generator of tuples with the system clock, the monotonic
+            clock, the device index and the lines of the message.
+        """
+        decoder = ClockDecoder()
+        record = (-1, -1, index, [])
+        while True:
+            lines = device.read_lines()
+            if lines is None:
+                break
+            for line in lines:
+                clocks = decoder.decode(line)
+                if clocks is None:
+                    record[3].append(line)
+                    continue
+                if record[3]:
+                    yield record
+                monotonic = -1 if clocks[0] is None else clocks[0]
+                record = (clocks[1], monotonic, index, [line])
+        if record[3]:
+            yield record
+
+    def get_position(self):
+        """Get the number of bytes read from the files."""
+        return sum(device.get_position() for device in self.devices)
+
+    def read_lines(self):
+        """Read and return the next DDS log messages as a list.
+
+        The lines don't contain the end of line characters.
+        Return None on EOF.
+        """
+        lines = []
+        for record in self._records:
+            lines.extend(record[3])
+            if len(lines) >= self.BATCH_SIZE:
+                break
+        if self.show_progress:
+            self.print_status()
+        return lines or None
+
+    def read_line(self):
+        """Read and return the next DDS log message from the device.
+
+        Return None on EOF or error.
+        """
+        if not self._lines:
+            self._lines = self.read_lines()
+            if self._lines is None:
+                self._lines = []
+                return None
+            self._lines.reverse()
+        return self._lines.pop() + "\n"
+
+    def close(self):
+        """Close the input devices."""
+        for device in self.devices:
+            device.close()
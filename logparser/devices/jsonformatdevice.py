@@ -0,0 +1,193 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Format device to show the output as JSON Lines.
+
+Each line of the output is a JSON object with a 'type' field. There is an
+object for each message and the summary is written as objects with the
+statistics, threads, locators, names, configurations, warnings and errors.
+The timestamp of the messages is the system clock in microseconds.
+
+Classes:
+  + JsonFormatDevice: Format device for JSON Lines.
+"""
+from __future__ import absolute_import
+from json import JSONEncoder
+
+from logparser.__init__ import __version__
+from logparser.devices.formatdevice import FormatDevice
+
+
+class JsonFormatDevice(FormatDevice):
+    """Format device for JSON Lines.
+
+    Functions:
+      + write_header: write the header.
+      + write_message: write the message.
+      + write_warnings: write the warning messages.
+      + write_errors: write the error messages.
+      + write_configurations: write the configuration messages.
+      + write_object: write a JSON object.
+      + write_countset: write a generic log message list.
+      + write_locators: write the locators.
+      + write_host_summary: write the host summary.
+      + write_statistics_bandwidth: write the bandwidth statistics.
+      + write_statistics_packets: write the packet statistics.
+      + write_threads_info: write the threads information.
+    """
+
+    def __init__(self, state):
+        """Initialize the device."""
+        self.write = state.output_device.write
+        self.encode = JSONEncoder(separators=(',', ':')).encode
+
+    def write_object(self, obj):
+        """Write a JSON object."""
+        self.write(self.encode(obj))
+
+    def write_header(self, state):
+        """Write the header."""
+        self.write_object({'type': 'header', 'version': __version__})
+
+    def write_message(self, message, state):
+        """Write the message."""
+        msg = {'type': 'message', 'description': message.description,
+               'line': message.input_line}
+        if message.kind:
+            msg['kind'] = message.get_kind_names()
+        if message.inout is not None:
+            msg['direction'] = message.inout
+        if message.remote is not None:
+            msg['remote'] = message.remote
+        if message.entity is not None:
+            msg['entity'] = message.entity
+        if message.clock is not None:
+            msg['timestamp'] = message.clock
+        self.write_object(msg)
+
+    def write_warnings(self, state):
+        """Write the warning messages."""
+        self.write_countset(state.warnings, 'warnings')
+
+    def write_errors(self, state):
+        """Write the error messages."""
+        self.write_countset(state.errors, 'errors')
+
+    def write_configurations(self, state):
+        """Write the configuration messages."""
+        if state.locators:
+            self.write_locators(state)
+        if state.name_table:
+            self.write_host_summary(state)
+        if state.statistics and not state.no_stats:
+            self.write_statistics_bandwidth(state)
+        if state.statistics_packet and not state.no_stats:
+            self.write_statistics_packets(state)
+        if state.threads and not state.no_stats:
+            self.write_threads_info(state)
+        self.write_countset(state.config, 'config')
+
+    def write_countset(self, items, typ):
+        """Write a generic log message list."""
+        self.write_object({
+            'type': typ,
+            'items': [{'id': i, 'message': msg, 'count': count}
+                      for i, msg, count in items.elements()]})
+
+    def write_locators(self, state):
+        """Write the locators."""
+        for part in state.locators:
+            self.write_object({
+                'type': 'locators', 'participant': part,
+                'send': list(state.locators[part]['send']),
+                'receive': list(state.locators[part]['receive'])})
+
+    def write_host_summary(self, state):
+        """Write the host summary."""
+        table = state.name_table
+        names = state.names
+        hosts = []
+        for host in table:
+            apps = []
+            for app in table[host]:
+                addr = host + " " + app
+                participants = [{'name': names.get(addr + " " + part),
+                                 'id': part}
+                                for part in table[host][app]]
+                apps.append({'name': names.get(addr), 'id': app,
+                             'participants': participants})
+            hosts.append({'name': names.get(host), 'address': host,
+                          'apps': apps})
+        self.write_object({'type': 'names', 'hosts': hosts})
+
+    def write_statistics_bandwidth(self, state):
+        """Write the bandwidth statistics.
+
+        The counters have the first and last clocks in microseconds and the
+        number of bytes. The rates are per second.
+        """
+        stats = state.statistics
+        rates = state.statistics_rate
+        for addr in stats:
+            counters = {}
+            ports = {}
+            for typ in stats[addr]:
+                # If this is a port with dictionary of statistics types
+                if isinstance(stats[addr][typ], dict):
+                    ports[str(typ)] = dict(
+                        (port_typ, self._get_throughput(
+                            info, rates.get((addr, typ, port_typ))))
+                        for port_typ, info in stats[addr][typ].items())
+                else:
+                    counters[typ] = self._get_throughput(
+                        stats[addr][typ], rates.get((addr, None, typ)))
+            self.write_object({'type': 'bandwidth', 'address': addr,
+                               'counters': counters, 'ports': ports})
+
+    @staticmethod
+    def _get_throughput(info, series=None):
+        """Get the throughput information of a counter."""
+        time_diff = (info[1] - info[0]) / 1000000.0
+        throughput = {
+            'start': info[0], 'end': info[1], 'bytes': info[2],
+            'throughput': info[2] / time_diff if time_diff > 0 else None}
+        if series is not None:
+            throughput['rates'] = series.get_summary()
+            throughput['rates']['interval'] = series.interval
+            throughput['rates']['bursts'] = [
+                {'start': start, 'end': end, 'bytes': qty,
+                 'packets': packets}
+                for start, end, qty, packets in series.get_bursts()]
+        return throughput
+
+    def write_statistics_packets(self, state):
+        """Write the packet statistics."""
+        stats = {}
+        for guid, typ, total, packets in \
+                state.statistics_packet.get_counters():
+            counters = stats.setdefault(guid, {})
+            counters[typ] = dict([('ALL', total)] + packets)
+        for guid in stats:
+            self.write_object({'type': 'packets', 'guid': guid,
+                               'counters': stats[guid]})
+
+    def write_threads_info(self, state):
+        """Write the threads information."""
+        info = state.threads
+        threads = [info[name] for name in info if name != 'all']
+        self.write_object({
+            'type': 'threads',
+            'count': info['all'] if 'all' in info else len(info),
+            'threads': threads})
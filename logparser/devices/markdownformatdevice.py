@@ -21,6 +21,7 @@ Classes:
 from __future__ import absolute_import
 from logparser.__init__ import __version__
 from logparser.devices.formatdevice import FormatDevice
+from logparser.logger import KIND_ERROR, KIND_IMPORTANT, KIND_WARNING
 
 
 class MarkdownFormatDevice(FormatDevice):
@@ -42,11 +43,14 @@ class MarkdownFormatDevice(FormatDevice):
       + bytes_to_string: convert a byte unit value into string.
     """
 
+    INOUT_COLUMN = {None: "".ljust(9), 'in': "---> ".center(9),
+                    'out': " <---".center(9)}
+
     def __init__(self, state):
         """Initialize the device."""
-        self.write = state['output_device'].write
-        self.show_timestamp = not state['no_timestamp']
-        self.show_lines = state['show_lines']
+        self.write = state.output_device.write
+        self.show_timestamp = not state.no_timestamp
+        self.show_lines = state.show_lines
 
     def write_header(self, state):
         """Write the header."""
@@ -82,57 +86,51 @@ class MarkdownFormatDevice(FormatDevice):
         self.write(header)
         self.write(headln)
 
-    def write_message(self, content, state):
+    def write_message(self, message, state):
         """Write the message."""
         # Create the standard message
-        if 'inout' not in content:
-            inout = "".ljust(9)
-        elif content['inout'] == 'in':
-            inout = "---> ".center(9)
-        else:
-            inout = " <---".center(9)
-        description = content['description']
-        kinds = content.get('kind').split("|") if 'kind' in content else [""]
-        if 'ERROR' in kinds or 'IMPORTANT' in kinds:
+        inout = self.INOUT_COLUMN[message.inout]
+        description = message.description
+        if message.kind & (KIND_ERROR | KIND_IMPORTANT):
             description = "**" + description + "**"
-        elif 'WARNING' in kinds:
+        elif message.kind & KIND_WARNING:
             description = "*" + description + "*"
-        remote = content.get('remote', '').center(24)
-        entity = content.get('entity', '').center(16)
+        remote = (message.remote or '').center(24)
+        entity = (message.entity or '').center(16)
         msg = "%s|%s|%s| %s" % (remote, inout, entity, description)
 
         # Add the optional columns
         if self.show_timestamp:
-            timestamp = content.get('timestamp', '').center(28)
+            timestamp = (message.timestamp or '').center(28)
             msg = timestamp + "|" + msg
         if self.show_lines:
-            msg = " %05d/%04d |%s" % (content['input_line'],
-                                      content['output_line'], msg)
+            msg = " %05d/%04d |%s" % (message.input_line,
+                                      message.output_line, msg)
 
         self.write(msg)
 
     def write_warnings(self, state):
         """Write the warning messages."""
-        self.write_countset(state['warnings'], "Warnings")
+        self.write_countset(state.warnings, "Warnings")
 
     def write_errors(self, state):
         """Write the warning messages."""
-        self.write_countset(state['errors'], "Errors")
+        self.write_countset(state.errors, "Errors")
 
     def write_configurations(self, state):
         """Write the configuration messages."""
         self.write("----------------------")
-        if 'locators' in state:
+        if state.locators:
             self.write_locators(state)
-        if 'names' in state and 'name_table' in state:
+        if state.name_table:
             self.write_host_summary(state)
-        if 'statistics' in state and not state['no_stats']:
+        if state.statistics and not state.no_stats:
             self.write_statistics_bandwidth(state)
-        if 'statistics_packet' in state and not state['no_stats']:
+        if state.statistics_packet and not state.no_stats:
             self.write_statistics_packets(state)
-        if 'threads' in state and not state['no_stats']:
+        if state.threads and not state.no_stats:
             self.write_threads_info(state)
-        self.write_countset(state['config'], 'Config')
+        self.write_countset(state.config, 'Config')
 
     def write_countset(self, items, title):
         """Write a generic log message list."""
@@ -145,13 +143,13 @@ class MarkdownFormatDevice(FormatDevice):
     def write_locators(self, state):
         """Write the locators if any."""
         self.write("### Locators:")
-        for part in state['locators']:
+        for part in state.locators:
             self.write("* Participant: " + part)
             self.write("    * Send locators:")
-            for loc in state['locators'][part]['send']:
+            for loc in state.locators[part]['send']:
                 self.write("        * " + loc)
             self.write("    * Receive locators:")
-            for loc in state['locators'][part]['receive']:
+            for loc in state.locators[part]['receive']:
                 self.write("        * " + loc)
         self.write()
 
@@ -161,8 +159,8 @@ class MarkdownFormatDevice(FormatDevice):
 
         apps_num = 0
         part_num = 0
-        table = state['name_table']
-        names = state['names']
+        table = state.name_table
+        names = state.names
         for host in table:
             # Print host
             if host in names:
@@ -200,57 +198,80 @@ class MarkdownFormatDevice(FormatDevice):
         """Write the bandwidth statistics."""
         self.write("### Bandwidth statistics:")
 
-        stats = state['statistics']
+        stats = state.statistics
+        rates = state.statistics_rate
         for addr in stats:
             self.write("* Address: %s" % addr)
             for typ in stats[addr]:
                 # If this is a port with dictionary of statistics types
                 if isinstance(stats[addr][typ], dict):
-                    if state['verbosity'] < 1:
+                    if state.verbosity < 1:
                         continue
                     port = typ
                     self.write("    * Port %s" % port)
                     for typ in stats[addr][port]:
                         info = stats[addr][port][typ]
-                        self.write_throughput("        * %s: " % typ, info)
+                        self.write_throughput("        * %s: " % typ, info,
+                                              rates.get((addr, port, typ)))
                 # If this is the host counter
                 else:
                     info = stats[addr][typ]
-                    self.write_throughput("    * %s: " % typ, info)
+                    self.write_throughput("    * %s: " % typ, info,
+                                          rates.get((addr, None, typ)))
         self.write()
 
-    def write_throughput(self, prefix, info):
-        """Write the throughput information."""
-        time_diff = info[1] - info[0]
+    def write_throughput(self, prefix, info, series=None):
+        """Write the throughput information.
+
+        The rates and the bursts are written if the time series has more
+        than one interval. The bursts start from the first clock.
+        """
+        time_diff = (info[1] - info[0]) / 1000000.0
         qty = self.bytes_to_string(info[2])
         if time_diff > 0:
             throughput = self.bytes_to_string(info[2] / time_diff)
             self.write("%s%s (%s/s)" % (prefix, qty, throughput))
         else:
             self.write("%s%s" % (prefix, qty))
+        if series is None or series.first == series.last:
+            return
+
+        indent = " " * (len(prefix) - len(prefix.lstrip()) + 4)
+        summary = series.get_summary()
+        rates = summary['bytes']
+        self.write("%s* Rate: peak %s/s, p50 %s/s, p99 %s/s" % (
+            indent, self.bytes_to_string(rates['peak']),
+            self.bytes_to_string(rates['p50']),
+            self.bytes_to_string(rates['p99'])))
+        rates = summary['packets']
+        self.write("%s* Packets: peak %d/s, p50 %d/s, p99 %d/s" % (
+            indent, rates['peak'], rates['p50'], rates['p99']))
+        for start, end, qty, packets in series.get_bursts():
+            self.write("%s* Burst: %.1f s - %.1f s, %s in %d packets" % (
+                indent, (start - info[0]) / 1000000.0,
+                (end - info[0]) / 1000000.0, self.bytes_to_string(qty),
+                packets))
 
     def write_statistics_packets(self, state):
         """Write the packet statistics."""
         self.write("### Packet statistics:")
-        stats = state['statistics_packet']
-        for guid in stats:
-            self.write("* GUID: %s" % guid)
-            for typ in stats[guid]:
-                total = float(stats[guid][typ]['ALL'])
-                self.write("    * %s: %d packets" % (typ, total))
-                for packet in stats[guid][typ]:
-                    if packet == "ALL":
-                        continue
-                    qty = stats[guid][typ][packet]
-                    self.write("        * %s: %d (%.1f%%)" %
-                               (packet, qty, qty / total * 100))
+        last_guid = None
+        for guid, typ, total, packets in \
+                state.statistics_packet.get_counters():
+            if guid != last_guid:
+                self.write("* GUID: %s" % guid)
+                last_guid = guid
+            self.write("    * %s: %d packets" % (typ, total))
+            for packet, qty in packets:
+                self.write("        * %s: %d (%.1f%%)" %
+                           (packet, qty, qty * 100.0 / total))
         self.write()
 
     def write_threads_info(self, state):
         """Write the threads information."""
         self.write("### Threads Information:")
 
-        info = state['threads']
+        info = state.threads
         num_threads = info['all'] if 'all' in info else len(info)
         self.write("* Number of threads: %d" % num_threads)
 
@@ -276,7 +297,7 @@ class MarkdownFormatDevice(FormatDevice):
     @staticmethod
     def bytes_to_string(qty):
         """Convert a byte unit value into string."""
-        typ = ["GB", "MB", "KB", "B"]
+        typ = ["B", "KB", "MB", "GB"]
         for i in range(len(typ) - 1, 0, -1):
             rang = float(2 ** (10 * i))
             if qty > rang:
@@ -19,10 +19,13 @@ The module contains the output devices to write the logs.
 
 Classes:
   + OutputDevice: Abstract base class for output device implementations
+  + BufferedOutputDevice: Base class for devices that write by blocks.
   + ConsoleDevice: Console device. Writes output into the standard output.
   + FileDevice: File device. Writes the output into a file.
 """
 from __future__ import print_function
+from sys import stdout
+from time import time
 
 
 class OutputDevice(object):
@@ -31,73 +34,130 @@ class OutputDevice(object):
     You will need to implement the following methods:
         + write: Write the log into the device.
         + close: Close the device.
+
+    Optionally, you can implement the following methods:
+        + flush: Write any buffered log into the device.
     """
 
     def write(self, text=""):
         """Write the log into the device."""
         raise NotImplementedError("write not implemented")
 
+    def flush(self):
+        """Write any buffered log into the device."""
+        pass
+
     def close(self):
         """Close the device."""
         raise NotImplementedError("close not implemented")
 
 
-class OutputConsoleDevice(OutputDevice):
+class BufferedOutputDevice(OutputDevice):
+    """Base class for devices that write by blocks.
+
+    The logs are kept in a buffer that is written at once when it reaches
+    the size threshold or when the time threshold from the last write
+    expires. The output line count is updated for every log.
+
+    You will need to implement the following methods:
+        + write_buffer: Write a block of text into the device.
+        + close: Close the device.
+
+    Functions:
+      + __init__: Initialize the buffer.
+      + write: Add the log to the buffer.
+      + flush: Write the buffered logs into the device.
+    """
+
+    MAX_BUFFER_SIZE = 64 * 1024
+    MAX_BUFFER_TIME = 0.2
+
+    def __init__(self, state, prefix=""):
+        """Initialize the buffer."""
+        self.state = state
+        self.prefix = prefix
+        self._buffer = []
+        self._buffer_size = 0
+        self._last_flush = time()
+
+    def write(self, text=""):
+        """Add the log to the buffer."""
+        self.state.output_line += 1
+        self._buffer.append(text)
+        self._buffer_size += len(text)
+        if self._buffer_size >= self.MAX_BUFFER_SIZE or \
+                time() - self._last_flush >= self.MAX_BUFFER_TIME:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered logs into the device."""
+        self._last_flush = time()
+        if not self._buffer:
+            return
+        text = self.prefix + ("\n" + self.prefix).join(self._buffer) + "\n"
+        self._buffer = []
+        self._buffer_size = 0
+        self.write_buffer(text)
+
+    def write_buffer(self, text):
+        """Write a block of text into the device."""
+        raise NotImplementedError("write_buffer not implemented")
+
+
+class OutputConsoleDevice(BufferedOutputDevice):
     """Console device. Writes output into the standard output.
 
     Functions:
       + __init__: Initialize the device with the specified file path.
-      + write: Write the log into the standard output.
-      + close: Do nothing, no need to close device.
+      + write_buffer: Write a block of text into the standard output.
+      + close: Write the buffered logs.
     """
 
     def __init__(self, state):
         """Initialize the device."""
-        self.support_ansi = state['show_progress']
-        self.state = state
-
-    def write(self, text=""):
-        """Write the log into the standard output."""
-        self.state['output_line'] += 1
         # 33[k is an ANSI code to clear the line
         # We need it to clear the optional progress bar.
-        if self.support_ansi:
-            print("\033[K" + text)
-        else:
-            # Catch any potential exception when piping the output and
-            # terminating the program.
-            try:
-                print(text)
-            except IOError:
-                # It makes no sense to print the error since we already had
-                # an exception printing a message.
-                pass
+        self.support_ansi = state.show_progress and stdout.isatty()
+        super(OutputConsoleDevice, self).__init__(
+            state, "\033[K" if self.support_ansi else "")
+
+    def write_buffer(self, text):
+        """Write a block of text into the standard output."""
+        # Catch any potential exception when piping the output and
+        # terminating the program.
+        try:
+            stdout.write(text)
+            stdout.flush()
+        except IOError:
+            # It makes no sense to print the error since we already had
+            # an exception printing a message.
+            pass
 
     def close(self):
-        """Do nothing, no need to close device."""
-        pass
+        """Write the buffered logs, no need to close device."""
+        self.flush()
 
 
-class OutputFileDevice(OutputDevice):
+class OutputFileDevice(BufferedOutputDevice):
     """File device. Writes the output into a file.
 
     Functions:
       + __init__: Initialize the device with the specified file path.
-      + write: Write the log into a file stream.
+      + write_buffer: Write a block of text into a file stream.
       + close: Close the file stream.
     """
 
     def __init__(self, state, file_path, overwrite):
         """Initialize the device with the specified file path."""
+        super(OutputFileDevice, self).__init__(state)
         open_mode = "w" if overwrite else "a"
         self.stream = open(file_path, open_mode)
-        self.state = state
 
-    def write(self, text=""):
-        """Write the log into a file stream."""
-        self.state['output_line'] += 1
-        self.stream.write(text + "\n")
+    def write_buffer(self, text):
+        """Write a block of text into a file stream."""
+        self.stream.write(text)
 
     def close(self):
         """Close the file stream."""
+        self.flush()
         self.stream.close()
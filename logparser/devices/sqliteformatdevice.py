@@ -0,0 +1,215 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Format device to write the output into a SQLite database.
+
+The messages are inserted into the 'messages' table in batches, inside a
+single transaction. The indexes are created after loading the messages,
+together with the summary tables: names, bandwidth, rates, packets,
+threads, locators and countsets (configurations, warnings and errors).
+
+Classes:
+  + SqliteFormatDevice: Format device for SQLite.
+
+Constants:
+  + TABLES: Columns of the tables.
+  + INDEXES: Columns of the messages table with an index.
+"""
+from __future__ import absolute_import
+import sqlite3
+
+from logparser.devices.eventformatdevice import get_event_kind
+from logparser.devices.formatdevice import FormatDevice
+
+TABLES = {
+    'messages': "line INTEGER, timestamp INTEGER, kind TEXT, " +
+                "direction TEXT, remote TEXT, entity TEXT, description TEXT",
+    'names': "name TEXT, kind TEXT, address TEXT",
+    'bandwidth': "address TEXT, port TEXT, type TEXT, " +
+                 "first_clock INTEGER, last_clock INTEGER, bytes INTEGER",
+    'rates': "address TEXT, port TEXT, type TEXT, clock INTEGER, " +
+             "bytes INTEGER, packets INTEGER",
+    'packets': "guid TEXT, type TEXT, packet TEXT, count INTEGER",
+    'threads': "name TEXT, kind TEXT, tid INTEGER, priority INTEGER, " +
+               "stack_size INTEGER, affinity TEXT",
+    'locators': "participant TEXT, direction TEXT, locator TEXT",
+    'countsets': "category TEXT, id INTEGER, message TEXT, count INTEGER"
+}
+INDEXES = ('remote', 'entity', 'timestamp')
+
+
+class SqliteFormatDevice(FormatDevice):
+    """Format device for SQLite.
+
+    The timestamp column is the system clock in microseconds.
+
+    Functions:
+      + write_header: create the tables.
+      + write_message: add the message to the batch of messages.
+      + write_warnings: write the warning messages.
+      + write_errors: write the error messages.
+      + write_configurations: write the configuration messages.
+      + write_rows: insert rows into a table.
+      + write_countset: write a generic log message list.
+      + write_locators: write the locators.
+      + write_host_summary: write the host summary.
+      + write_statistics_bandwidth: write the bandwidth statistics.
+      + write_statistics_packets: write the packet statistics.
+      + write_threads_info: write the threads information.
+      + flush: insert the batch of messages.
+      + close: create the indexes and commit the transaction.
+    """
+
+    BATCH_SIZE = 10000
+
+    def __init__(self, state, file_path):
+        """Initialize the device with the database path."""
+        self.connection = sqlite3.connect(file_path)
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("PRAGMA journal_mode = MEMORY")
+        self._messages = []
+
+    def write_header(self, state):
+        """Create the tables."""
+        for table in TABLES:
+            self.connection.execute("DROP TABLE IF EXISTS %s" % table)
+            self.connection.execute("CREATE TABLE %s (%s)" %
+                                    (table, TABLES[table]))
+
+    def write_message(self, message, state):
+        """Add the message to the batch of messages."""
+        clocks = state.clocks
+        self._messages.append((
+            message.input_line, clocks[1] if clocks else None,
+            get_event_kind(message), message.inout, message.remote,
+            message.entity, message.description))
+        if len(self._messages) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Insert the batch of messages."""
+        self.write_rows('messages', self._messages)
+        self._messages = []
+
+    def write_rows(self, table, rows):
+        """Insert rows into a table."""
+        if not rows:
+            return
+        self.connection.executemany(
+            "INSERT INTO %s VALUES (%s)" %
+            (table, ", ".join("?" * len(rows[0]))), rows)
+
+    def write_warnings(self, state):
+        """Write the warning messages."""
+        self.write_countset(state.warnings, 'warnings')
+
+    def write_errors(self, state):
+        """Write the error messages."""
+        self.write_countset(state.errors, 'errors')
+
+    def write_configurations(self, state):
+        """Write the configuration messages."""
+        self.flush()
+        if state.locators:
+            self.write_locators(state)
+        if state.name_table:
+            self.write_host_summary(state)
+        if state.statistics:
+            self.write_statistics_bandwidth(state)
+        if state.statistics_packet:
+            self.write_statistics_packets(state)
+        if state.threads:
+            self.write_threads_info(state)
+        self.write_countset(state.config, 'config')
+
+    def write_countset(self, items, category):
+        """Write a generic log message list."""
+        self.write_rows('countsets', [(category, i, msg, count)
+                                      for i, msg, count in items.elements()])
+
+    def write_locators(self, state):
+        """Write the locators."""
+        rows = []
+        for part in state.locators:
+            for direction in ('send', 'receive'):
+                rows += [(part, direction, loc)
+                         for loc in state.locators[part][direction]]
+        self.write_rows('locators', rows)
+
+    def write_host_summary(self, state):
+        """Write the host summary."""
+        table = state.name_table
+        names = state.names
+        rows = []
+        for host in table:
+            rows.append((names.get(host), 'host', host))
+            for app in table[host]:
+                addr = host + " " + app
+                rows.append((names.get(addr), 'app', addr))
+                rows += [(names.get(addr + " " + part), 'participant',
+                          addr + " " + part) for part in table[host][app]]
+        self.write_rows('names', rows)
+
+    def write_statistics_bandwidth(self, state):
+        """Write the bandwidth statistics.
+
+        The host counters don't have port. The rates table has the intervals
+        of the time series with packets.
+        """
+        stats = state.statistics
+        rows = []
+        for addr in stats:
+            for typ in stats[addr]:
+                # If this is a port with dictionary of statistics types
+                if isinstance(stats[addr][typ], dict):
+                    rows += [(addr, str(typ), port_typ) + tuple(info)
+                             for port_typ, info in stats[addr][typ].items()]
+                else:
+                    rows.append((addr, None, typ) + tuple(stats[addr][typ]))
+        self.write_rows('bandwidth', rows)
+
+        rows = []
+        for (addr, port, typ), series in state.statistics_rate.items():
+            port = None if port is None else str(port)
+            rows += [(addr, port, typ) + bucket
+                     for bucket in series.get_buckets() if bucket[2]]
+        self.write_rows('rates', rows)
+
+    def write_statistics_packets(self, state):
+        """Write the packet statistics."""
+        rows = []
+        for guid, typ, total, packets in \
+                state.statistics_packet.get_counters():
+            rows.append((guid, typ, 'ALL', total))
+            rows += [(guid, typ, packet, qty) for packet, qty in packets]
+        self.write_rows('packets', rows)
+
+    def write_threads_info(self, state):
+        """Write the threads information."""
+        info = state.threads
+        self.write_rows('threads', [
+            (info[name].get('name'), info[name].get('kind'),
+             info[name].get('tid'), info[name].get('priority'),
+             info[name].get('stack_size'), info[name].get('affinity'))
+            for name in info if name != 'all'])
+
+    def close(self):
+        """Create the indexes and commit the transaction."""
+        self.flush()
+        for column in INDEXES:
+            self.connection.execute(
+                "CREATE INDEX messages_%s ON messages (%s)" % (column, column))
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,123 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Library interface to parse logs into a stream of events.
+
+The lines can come from any iterable (a file, a socket, a list...) and the
+parsed messages are yielded as LogEvent records while iterating, so the
+logs are never formatted as text. For instance:
+
+    for event in parse_lines(open("log.txt"), kinds=['warning', 'error']):
+        print(event.line, event.description)
+
+Only the subscribed kinds of events are created, and the application
+events and packets are not even logged if they are not subscribed.
+
+Classes:
+  + LogEventParser: Parse logs into a stream of events.
+
+Functions:
+  + parse_lines: Parse an iterable of log lines into events.
+
+Constants:
+  + DEFAULT_OPTIONS: Default value of the parser options.
+"""
+from __future__ import absolute_import
+from argparse import Namespace
+
+from logparser.clockdecoder import ClockDecoder
+from logparser.devices.eventformatdevice import EVENT_KINDS, \
+    EventFormatDevice
+from logparser.logparser import LogParser
+
+# The texts can be unicode in Python 2.7 too.
+_STRING_TYPES = (str, type(u""))
+
+DEFAULT_OPTIONS = {
+    'v': 0, 'show_ip': False, 'obfuscate': False, 'salt': None,
+    'show_timestamp': False, 'show_lines': False, 'only': None,
+    'colors': False, 'highlight': None, 'local_host': None,
+    'no_network': False, 'no_inline': False, 'no_stats': False,
+    'debug': False, 'since': None, 'until': None, 'rate_interval': 1,
+    'rate_window': 3600}
+
+# The options of the input and output of the command-line are fixed.
+_STREAM_OPTIONS = {
+    'input': None, 'follow': False, 'checkpoint': None, 'mmap': False,
+    'obfuscation_map': None, 'jobs': None, 'pipeline': False, 'output': None,
+    'overwrite_output': None, 'write_original': None, 'no_progress': True,
+    'format': "markdown", 'sqlite': None, 'summary_only': False}
+
+
+class LogEventParser(object):
+    """Parse logs into a stream of events.
+
+    The options are the same as the command-line ones, with the name of
+    the argument (e.g.: show_ip=True, v=2). The since and until times are
+    system clocks in microseconds or texts in the command-line formats.
+    The parser state is kept after parsing, so it can be used for the
+    summary (e.g.: statistics).
+
+    Functions:
+      + parse: Parse the lines and yield the events lazily.
+    """
+
+    def __init__(self, kinds=None, **options):
+        """Initialize the parser with the kinds of events to yield."""
+        unknown = set(options) - set(DEFAULT_OPTIONS)
+        if unknown:
+            raise TypeError("Unknown options: %s" % ", ".join(unknown))
+        kinds = frozenset(EVENT_KINDS if kinds is None else kinds)
+        if not kinds <= frozenset(EVENT_KINDS):
+            raise ValueError("Unknown kinds of event: %s" %
+                             ", ".join(kinds - frozenset(EVENT_KINDS)))
+
+        values = dict(DEFAULT_OPTIONS)
+        values.update(options)
+        values.update(_STREAM_OPTIONS)
+        for name in ('since', 'until'):
+            if isinstance(values[name], _STRING_TYPES):
+                values[name] = ClockDecoder.parse_time(values[name])
+        self.device = EventFormatDevice(kinds)
+        self.parser = LogParser(Namespace(**values), self.device)
+        self.state = self.parser.state
+
+        # Don't create the messages that nobody will consume.
+        logger = self.parser.logger
+        logger.ignorePackets = logger.ignorePackets or 'packet' not in kinds
+        logger.ignoreEvents = 'event' not in kinds
+        logger.inline = logger.inline and \
+            ('warning' in kinds or 'error' in kinds)
+
+    def parse(self, lines):
+        """Parse the lines and yield the events lazily.
+
+        Returns:
+            A generator of LogEvent records.
+        """
+        events = self.device.events
+        for line in lines:
+            self.parser.parse_line(line)
+            while events:
+                yield events.popleft()
+
+
+def parse_lines(lines, kinds=None, **options):
+    """Parse an iterable of log lines into events.
+
+    Returns:
+        A generator of LogEvent records.
+    """
+    return LogEventParser(kinds, **options).parse(lines)
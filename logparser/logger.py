@@ -15,13 +15,80 @@
 #   limitations under the License.
 """Logger.
 
-The module contains the class to log the messages.
+The module contains the classes to log the messages. The descriptions can
+be given as a template with its arguments, so they are only formatted if the
+message passes the verbosity and packet filters.
+
+Classes:
+  + LogMessage: Record of a message to write.
+  + Logger: Class to log the messages.
+  + SummaryLogger: Logger that only keeps the summary information.
+
+Constants:
+  + KIND_WARNING: Kind bit of the warning messages.
+  + KIND_ERROR: Kind bit of the error messages.
+  + KIND_IMPORTANT: Kind bit of the highlighted messages.
+  + KIND_NAMES: Name of each kind bit, in order.
 """
 
+KIND_WARNING = 1
+KIND_ERROR = 2
+KIND_IMPORTANT = 4
+KIND_NAMES = ((KIND_WARNING, 'WARNING'), (KIND_ERROR, 'ERROR'),
+              (KIND_IMPORTANT, 'IMPORTANT'))
+
+
+class LogMessage(object):
+    """Record of a message to write.
+
+    Attributes:
+        description (str): description of the message.
+        kind (int): bitmask of KIND_* remarks of the message.
+        inout (str): [packets-only] 'in' if it's input packet, 'out' for
+            output packets, None otherwise.
+        remote (str): [packets-only] the remote address of the
+            sender/receiver, None otherwise.
+        entity (str): [packets-only] the local entity sending/receiving.
+        timestamp (str): the timestamp of the message, or None.
+        clock (int): the system clock in microseconds, or None.
+        input_line (int): the current input line.
+        output_line (int): the current output line.
+    """
+
+    __slots__ = ('description', 'kind', 'inout', 'remote', 'entity',
+                 'timestamp', 'clock', 'input_line', 'output_line')
+
+    # Text fields to search with a regex, the description is the longest.
+    SEARCH_FIELDS = ('inout', 'remote', 'entity', 'timestamp', 'description')
+
+    def __init__(self, description, kind=0, inout=None, remote=None,
+                 entity=None):
+        """Initialize the message."""
+        self.description = description
+        self.kind = kind
+        self.inout = inout
+        self.remote = remote
+        self.entity = entity
+        self.timestamp = None
+        self.clock = None
+        self.input_line = 0
+        self.output_line = 0
+
+    def get_kind_names(self):
+        """Get the names of the kind bits of the message.
+
+        Returns:
+            list: names of the kind bits in order.
+        """
+        return [name for bit, name in KIND_NAMES if self.kind & bit]
+
 
 class Logger(object):
     """Class to log the messages.
 
+    The messages of the packets and events are dropped before formatting the
+    description if they are filtered by the verbosity level or ignored.
+
     Attributes:
         COLORS: colors to use in the logs
         KIND_TO_COLOR: logs messages to color
@@ -29,6 +96,7 @@ class Logger(object):
         verbosity (int): verbosity level of the log
         inline (bool): show warnings/erros in network logs
         ignorePackets (bool): ignore network events
+        ignoreEvents (bool): ignore application events
         showColors (bool): show colors in the log
         formatDevice (:obj:`FormatDevice`): format device to print the logs
         highlight (:obj:`compiled re`): show in bold regex matched logs
@@ -51,17 +119,18 @@ class Logger(object):
         }
 
         self._KIND_TO_COLOR = {
-            'WARNING': 'YELLOW|ITALIC',
-            'ERROR': 'RED|BOLD',
-            'IMPORTANT': 'BOLD'
+            KIND_WARNING: 'YELLOW|ITALIC',
+            KIND_ERROR: 'RED|BOLD',
+            KIND_IMPORTANT: 'BOLD'
         }
 
         self._state = state
         self._verbosity = 0
         self._inline = True
         self._ignorePackets = False
+        self._ignoreEvents = False
         self._showColors = False
-        self._formatDevice = self._state['format_device']
+        self._formatDevice = self._state.format_device
         self._highlight = None
         self._onlyIf = None
 
@@ -119,6 +188,24 @@ class Logger(object):
         """
         self._ignorePackets = value
 
+    @property
+    def ignoreEvents(self):
+        """Get if the application events are shown in the log.
+
+        Returns:
+            bool: True if the application events are ignored
+        """
+        return self._ignoreEvents
+
+    @ignoreEvents.setter
+    def ignoreEvents(self, value):
+        """Enable/disable the application events are shown in the log.
+
+        Args:
+            value (bool): ignore application events
+        """
+        self._ignoreEvents = value
+
     @property
     def colors(self):
         """Get if coloured logs are activated.
@@ -173,177 +260,205 @@ class Logger(object):
         """
         self._onlyIf = value
 
-    def _log(self, content, level):
+    def _log(self, message, level, args=None):
         """Log the given message.
 
         Args:
-            content (dict): the content argument is a dictionary with at
-                least 'description' item.
-                The optional items are:
-                  + kind: the kind or remark for the message.
-                  + timestamp: the timestamp of the message.
-                  + input_line: the current input line.
-                  + output_line: the current output line.
-                  + inout: [packets-only] 'in' if it's input packet,
-                    'out' otherwise.
-                  + remote: [packets-only] the remote address of
-                    the sender/receiver.
-                  + entity: [packets-only] the local entity sending/receiving.
+            message (:obj:`LogMessage`): the message to log. The clock,
+                the timestamp and the line numbers are set here.
             level (int): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
         if self._verbosity < level:
             return
-
-        # Add the clock if available
-        if 'clocks' in self._state and self._state['clocks'][1]:
-            content['timestamp'] = \
-                " %s " % self._state['clocks'][1].isoformat()
+        if args is not None:
+            message.description = message.description % args
+
+        # Add the clock if available, the text only if someone will use it
+        if self._state.clocks is not None:
+            message.clock = self._state.clocks[1]
+        if self._state.clocks is not None and (
+                not self._state.no_timestamp or
+                self.onlyIf or self.highlight):
+            message.timestamp = " %s " % \
+                self._state.clock_decoder.get_isoformat(
+                    self._state.clocks[1])
         # Add the current line
-        content['input_line'] = self._state['input_line']
+        message.input_line = self._state.input_line
         # This message count
-        content['output_line'] = self._state['output_line'] + 1
+        message.output_line = self._state.output_line + 1
 
         # Apply the filter
-        if self.onlyIf and not Logger._dict_regex_search(content, self.onlyIf):
+        if self.onlyIf and not Logger._regex_search(message, self.onlyIf):
             return
 
         # Highlight the message if match
-        if self.highlight and Logger._dict_regex_search(
-                content, self.highlight):
-            content['kind'] = content.get('kind', "") + "|IMPORTANT"
+        if self.highlight and Logger._regex_search(message, self.highlight):
+            message.kind |= KIND_IMPORTANT
 
         # Apply color if specified
-        if self._showColors:
+        if self._showColors and message.kind:
             color = ""
-            for kind in filter(None, content.get('kind', '').split("|")):
-                for subkind in self._KIND_TO_COLOR[kind].split("|"):
-                    color += self._COLORS[subkind]
-            if color:
-                content['description'] = color + content['description'] + \
-                    self._COLORS['END']
+            for bit, _ in KIND_NAMES:
+                if message.kind & bit:
+                    for subkind in self._KIND_TO_COLOR[bit].split("|"):
+                        color += self._COLORS[subkind]
+            message.description = color + message.description + \
+                self._COLORS['END']
 
         # Write the message
-        self._formatDevice.write_message(content, self._state)
+        self._formatDevice.write_message(message, self._state)
 
-    def recv(self, addr, entity, text, level=0):
+    def recv(self, addr, entity, text, level=0, args=None):
         """Log a received packet.
 
         Args:
             addr (str): source address of the package
             entity (str): source entity of the package
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
-        if self._ignorePackets:
+        if self._ignorePackets or self._verbosity < level:
             return
-        content = {'description': text, 'remote': addr, 'entity': entity,
-                   'inout': 'in'}
-        self._log(content, level)
+        self._log(LogMessage(text, 0, 'in', addr, entity), level, args)
 
-    def send(self, addr, entity, text, level=0):
+    def send(self, addr, entity, text, level=0, args=None):
         """Log a sent packet.
 
         Args:
             addr (str): destination address of the package
             entity (str): destination entity of the package
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
-        if self._ignorePackets:
+        if self._ignorePackets or self._verbosity < level:
             return
-        content = {'description': text, 'remote': addr, 'entity': entity,
-                   'inout': 'out'}
-        self._log(content, level)
+        self._log(LogMessage(text, 0, 'out', addr, entity), level, args)
 
-    def process(self, addr, entity, text, level=0):
+    def process(self, addr, entity, text, level=0, args=None):
         """Log a processed packet.
 
         Args:
             addr (str): source address of the package
             entity (str): source entity of the package
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
-        if self._ignorePackets:
+        if self._ignorePackets or self._verbosity < level:
             return
-        content = {'description': text, 'remote': addr, 'entity': entity}
-        self._log(content, level)
+        self._log(LogMessage(text, 0, None, addr, entity), level, args)
 
-    def cfg(self, text, level=0):
+    def cfg(self, text, level=0, args=None):
         """Log a configuration message.
 
         Args:
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
         if self._verbosity < level:
             return
-        self._state['config'].add(text)
+        if args is not None:
+            text = text % args
+        self._state.config.add(text)
 
-    def event(self, text, level=0):
+    def event(self, text, level=0, args=None):
         """Log an application event.
 
         Args:
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
-        content = {'description': text}
-        self._log(content, level)
+        if self._ignoreEvents or self._verbosity < level:
+            return
+        self._log(LogMessage(text), level, args)
 
-    def warning(self, text, level=0):
+    def warning(self, text, level=0, args=None):
         """Log a warning message.
 
         Args:
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
         if self._verbosity < level:
             return
+        if args is not None:
+            text = text % args
 
-        self._state['warnings'].add(text)
+        self._state.warnings.add(text)
         if self._inline:
-            content = {'description': "Warning: " + text, 'kind': 'WARNING'}
-            self._log(content, level)
+            self._log(LogMessage("Warning: " + text, KIND_WARNING), level)
 
-    def error(self, text, level=0):
+    def error(self, text, level=0, args=None):
         """Log an error.
 
         Args:
-            text (str): description
+            text (str): description or template of the description
             level (int,optional): verbosity level of the log message
+            args (tuple,optional): arguments of the description template
         """
         if self._verbosity < level:
             return
+        if args is not None:
+            text = text % args
 
-        self._state['errors'].add(text)
+        self._state.errors.add(text)
         if self._inline:
-            content = {'description': "Error: " + text, 'kind': 'ERROR'}
-            self._log(content, level)
+            self._log(LogMessage("Error: " + text, KIND_ERROR), level)
 
     @staticmethod
-    def _dict_regex_search(content, regex):
-        """Apply the regex over all the fields of the content.
+    def _regex_search(message, regex):
+        """Apply the regex over the text fields of the message.
 
         Args:
-            content (dict): the content argument is a dictionary with at
-                least 'description' item.
-                The optional items are:
-                  + kind: the kind or remark for the message.
-                  + timestamp: the timestamp of the message.
-                  + input_line: the current input line.
-                  + output_line: the current output line.
-                  + inout: [packets-only] 'in' if it's input packet,
-                    'out' otherwise.
-                  + remote: [packets-only] the remote address of
-                    the sender/receiver.
-                  + entity: [packets-only] the local entity sending/receiving.
+            message (:obj:`LogMessage`): the message to search
             regex (:obj:`compiled re`): regex to apply
 
         Returns:
-            bool: True if the regex match with at least one field of content
+            bool: True if the regex match with at least one field
         """
-        match = False
-        for field in content:
-            if isinstance(content[field], str):
-                match = match if match else regex.search(content[field])
-        return match
+        for field in LogMessage.SEARCH_FIELDS:
+            value = getattr(message, field)
+            if value is not None and regex.search(value):
+                return True
+        return bool(message.kind) and \
+            regex.search("|".join(message.get_kind_names())) is not None
+
+
+class SummaryLogger(Logger):
+    """Logger that only keeps the summary information.
+
+    The packets and events are discarded before creating any message, and
+    the warnings and errors are only counted for the summary.
+    """
+
+    def recv(self, addr, entity, text, level=0, args=None):
+        """Discard a received packet."""
+        pass
+
+    def send(self, addr, entity, text, level=0, args=None):
+        """Discard a sent packet."""
+        pass
+
+    def process(self, addr, entity, text, level=0, args=None):
+        """Discard a processed packet."""
+        pass
+
+    def event(self, text, level=0, args=None):
+        """Discard an application event."""
+        pass
+
+    def warning(self, text, level=0, args=None):
+        """Count a warning message."""
+        if self._verbosity >= level:
+            self._state.warnings.add(text if args is None else text % args)
+
+    def error(self, text, level=0, args=None):
+        """Count an error."""
+        if self._verbosity >= level:
+            self._state.errors.add(text if args is None else text % args)
@@ -24,18 +24,35 @@ Classes:
 """
 from __future__ import absolute_import
 import re
-from datetime import datetime, timedelta
+from datetime import timedelta
 from os import urandom
-from sys import exc_info
+from os.path import exists
+from sys import exc_info, stdout
 from traceback import extract_tb
 
-from logparser.countset import CountSet
-from logparser.devices.inputdevices import InputConsoleDevice, InputFileDevice
+from logparser.checkpoint import load_checkpoint, save_checkpoint
+from logparser.clockdecoder import ClockDecoder
+from logparser.devices.inputdevices import (InputBlockFileDevice,
+                                            InputConsoleDevice,
+                                            InputMergeDevice,
+                                            InputMmapFileDevice,
+                                            get_compression)
+from logparser.devices.jsonformatdevice import JsonFormatDevice
 from logparser.devices.markdownformatdevice import MarkdownFormatDevice
 from logparser.devices.outputdevices import (OutputConsoleDevice,
                                              OutputFileDevice)
-from logparser.logger import Logger
-from logparser.logs.logs import create_regex_list
+from logparser.devices.sqliteformatdevice import SqliteFormatDevice
+from logparser.logger import Logger, SummaryLogger
+from logparser.logs.logs import (create_line_prefilter, create_regex_index,
+                                 create_regex_list, create_warmup_regex_list,
+                                 get_line_expressions)
+from logparser.obfuscator import Obfuscator
+from logparser.parallel import match_ranges
+from logparser.pipeline import (Pipeline, PipelineFormatDevice,
+                                PipelineOutputDevice)
+from logparser.rateseries import get_rate_parameters
+from logparser.state import ParserState
+from logparser.timeindex import find_entry, get_index, warm_up
 from logparser.utils import compare_times
 
 
@@ -44,39 +61,77 @@ class LogParser(object):
 
     Functions:
       + process: process all the logs.
+      + parse_line: parse a log line given by the caller.
       + write_summary: write results of config, errors and warnings.
-      + _check_time_distance_: check that the distance between logs.
+      + _check_time_distance: check that the distance between logs.
       + _get_urandom: get a cryptographic random value.
-      + _initialize_state: initialize the state dictionary.
+      + _initialize_state: initialize the parser state.
+      + _initialize_prefilter: skip the raw lines that cannot match.
+      + _initialize_time_window: prepare the parsing of a time range.
+      + _resume: resume the parsing from the checkpoint if it exists.
+      + _save_checkpoint: save the checkpoint if the input was parsed.
+      + _load_obfuscation_map: load the salt and the obfuscated names.
+      + _save_obfuscation_map: save the obfuscated names and the salt.
+      + _seek_time_window: skip the logs before the time range.
       + _parse_log: parse a log file.
+      + _parse_log_parallel: parse a log file matching lines in parallel.
+      + _parse_record: parse a line matched in parallel.
+      + _flush_output: write the buffered output.
+      + _parse_line: parse a log line.
+      + _log_script_error: log the exception raised parsing a line.
       + _match_line: try to match a log line with the regular expressions.
       + _match_data: try to match the log date.
+      + _set_clocks: set the clocks of the current log line.
+      + _update_time_window: check if a system clock is in the time range.
     """
 
-    def __init__(self, args):
-        """Initialize the rtilogparser."""
-        self.state = {}
-        self._initialize_state(args)
-        self.formatter = self.state['format_device']
-        self._logger = Logger(self.state)
+    def __init__(self, args, format_device=None):
+        """Initialize the rtilogparser.
+
+        The arguments have the options of the command-line. The messages
+        are written with the given format device, Markdown by default.
+        """
+        self.state = ParserState()
+        self._initialize_state(args, format_device)
+        self.formatter = self.state.format_device
+        self.pipeline = None
+        if args.pipeline:
+            self.pipeline = Pipeline(self.state.input_device)
+            self.state.format_device = \
+                PipelineFormatDevice(self.formatter, self.pipeline)
+        if args.summary_only:
+            self._logger = SummaryLogger(self.state)
+        else:
+            self._logger = Logger(self.state)
         self._initialize_logger(args)
+        self.obfuscation_map = args.obfuscation_map
+        self._fixed_salt = args.salt is not None
         self.expressions = create_regex_list(self.state)
+        self.expressions_index = create_regex_index(self.expressions)
+        self.expressions_cache = {}
+        self._initialize_prefilter(args)
+        self._initialize_time_window(args)
         self.originalOutput = None
+        self._lines = iter([])
+        self._ranges = None
+        self._range_line = [0, 0]
+        self.checkpoint = args.checkpoint
+        self._completed = False
 
     def _check_time_distance(self, new_clocks, old_clocks):
         """Check that the distance between logs it's not large."""
-        MAX_TIME_SEC = 60
-        result = compare_times(old_clocks[1], new_clocks[1],
-                               timedelta(seconds=MAX_TIME_SEC))
+        MAX_TIME_USEC = 60 * 1000000
+        result = compare_times(old_clocks[1], new_clocks[1], MAX_TIME_USEC)
         if result:
             self._logger.warning("System clock went %s by %s." %
-                                 (result[0], result[1]))
+                                 (result[0],
+                                  timedelta(microseconds=result[1])))
 
-        if new_clocks[0]:
-            result = compare_times(old_clocks[0], new_clocks[0], MAX_TIME_SEC)
+        if new_clocks[0] is not None and old_clocks[0] is not None:
+            result = compare_times(old_clocks[0], new_clocks[0], MAX_TIME_USEC)
             if result:
                 self._logger.warning("Monotonic clock went %s by %.3f." %
-                                     (result[0], result[1]))
+                                     (result[0], result[1] / 1000000.0))
 
     @staticmethod
     def _get_urandom():
@@ -88,39 +143,65 @@ class LogParser(object):
             rnd = "".join("%02X" % ord(x) for x in rnd)
         return rnd
 
-    def _initialize_state(self, args):
-        """Initialize the state dictionary."""
-        self.state['warnings'] = CountSet()
-        self.state['errors'] = CountSet()
-        self.state['config'] = CountSet()
-        self.state['no_timestamp'] = not args.show_timestamp
-        self.state['obfuscate'] = args.obfuscate
-        self.state['salt'] = args.salt or LogParser._get_urandom()
-        self.state['assign_names'] = not args.show_ip
-        self.state['no_stats'] = args.no_stats
-        self.state['show_progress'] = not args.no_progress
-        self.state['show_lines'] = args.show_lines
-        self.state['write_original'] = args.write_original
-        self.state['output_line'] = 0
-        self.state['input_line'] = 0
-        self.state['debug'] = args.debug
+    @property
+    def logger(self):
+        """Get the logger of the parsed messages."""
+        return self._logger
+
+    def _initialize_state(self, args, format_device=None):
+        """Initialize the parser state."""
+        self.state.no_timestamp = not args.show_timestamp
+        self.state.obfuscate = args.obfuscate
+        self.state.salt = args.salt or LogParser._get_urandom()
+        self.state.obfuscator = Obfuscator(self.state.salt)
+        self.state.assign_names = not args.show_ip
+        self.state.no_stats = args.no_stats
+        self.state.rate_interval, self.state.rate_buckets = \
+            get_rate_parameters(args.rate_interval, args.rate_window)
+        # The progress is written into the standard output, so it would be
+        # mixed with the logs if the output is redirected.
+        self.state.show_progress = not args.no_progress and \
+            (stdout.isatty() or bool(args.output or args.overwrite_output))
+        self.state.show_lines = args.show_lines
+        self.state.write_original = args.write_original
+        self.state.output_line = 0
+        self.state.input_line = 0
+        self.state.debug = args.debug
+        self.state.clock_decoder = ClockDecoder()
+        # The input file if there is only one, it may be read again.
+        inputs = args.input or []
+        self.state.input_file = inputs[0] if len(inputs) == 1 else None
+        self.state.jobs = args.jobs or 1
         if args.local_host:
-            self.state['local_address'] = tuple(args.local_host.split(","))
+            self.state.local_address.add(
+                tuple(args.local_host.split(",")[:2]))
         if args.output:
-            self.state['output_device'] = \
+            self.state.output_device = \
                 OutputFileDevice(self.state, args.output, False)
         elif args.overwrite_output:
-            self.state['output_device'] = \
+            self.state.output_device = \
                 OutputFileDevice(self.state, args.overwrite_output, True)
         else:
-            self.state['output_device'] = OutputConsoleDevice(self.state)
-        if args.input:
-            self.state['input_device'] = \
-                InputFileDevice(args.input, self.state)
+            self.state.output_device = OutputConsoleDevice(self.state)
+        if len(inputs) > 1:
+            self.state.input_device = InputMergeDevice(
+                [InputBlockFileDevice(path, self.state) for path in inputs],
+                self.state)
+        elif inputs and args.mmap:
+            self.state.input_device = \
+                InputMmapFileDevice(inputs[0], self.state)
+        elif inputs:
+            self.state.input_device = InputBlockFileDevice(
+                inputs[0], self.state, follow=args.follow)
         else:
-            self.state['input_device'] = InputConsoleDevice(self.state)
-        self.state['verbosity'] = args.v or 0
-        self.state['format_device'] = MarkdownFormatDevice(self.state)
+            self.state.input_device = InputConsoleDevice(self.state)
+        self.state.verbosity = args.v or 0
+        if format_device is None and args.sqlite:
+            format_device = SqliteFormatDevice(self.state, args.sqlite)
+        elif format_device is None and args.format == "jsonl":
+            format_device = JsonFormatDevice(self.state)
+        self.state.format_device = \
+            format_device or MarkdownFormatDevice(self.state)
 
     def _initialize_logger(self, args):
         self._logger.verbosity = args.v or 0
@@ -132,22 +213,78 @@ class LogParser(object):
         if args.only:
             self._logger.onlyIf = re.compile(args.only)
 
+    def _initialize_prefilter(self, args):
+        """Skip the raw lines that cannot match before decoding them."""
+        # The original log and the debug mode need every line.
+        device = self.state.input_device
+        if not isinstance(device, InputMmapFileDevice) or args.debug or \
+                args.write_original:
+            return
+
+        may_match = create_line_prefilter(self.expressions)
+
+        def prefilter(buff, start, end):
+            """Get the part of the raw line to parse."""
+            if may_match(buff, start, end):
+                return (start, end)
+            # Keep only the clocks of the skipped lines.
+            return ClockDecoder.find_clocks(buff, start, end)
+        device.prefilter = prefilter
+
+    def _initialize_time_window(self, args):
+        """Prepare the parsing of a time range.
+
+        The logs before the range only run the discovery expressions to
+        create the names, and without output. The parsing ends with the
+        first log after the range.
+        """
+        self._default_matcher = (self.expressions, self.expressions_index,
+                                 self.expressions_cache, self._logger)
+        self._matcher = self._default_matcher
+        self._time_window = None
+        if args.since is None and args.until is None:
+            return
+
+        self._time_window = (args.since, args.until)
+        warmup_logger = Logger(self.state)
+        warmup_logger.verbosity = -1
+        warmup_expressions = create_warmup_regex_list(self.expressions)
+        self._warmup_matcher = (warmup_expressions,
+                                create_regex_index(warmup_expressions), {},
+                                warmup_logger)
+        if args.since is not None:
+            self._matcher = self._warmup_matcher
+
     def process(self):
         """Process all the logs."""
         # Create the original log file
-        if self.state['write_original']:
+        if self.state.write_original:
             self.originalOutput = OutputFileDevice(
                 self.state,
-                self.state['write_original'],
+                self.state.write_original,
                 True)
 
         # Read log file and parse
         self.formatter.write_header(self.state)
+        if self.checkpoint:
+            self._resume()
+        if self.obfuscation_map and self.state.obfuscate:
+            self._load_obfuscation_map()
+        if self._time_window and self._time_window[0] is not None:
+            self._seek_time_window()
+        if self.pipeline:
+            if self.originalOutput:
+                self.originalOutput = \
+                    PipelineOutputDevice(self.originalOutput, self.pipeline)
+            self.pipeline.start()
         try:
             self._parse_log()
         except KeyboardInterrupt:
             self._logger.warning("Catched SIGINT")
 
+            # Stop waiting for new logs in follow mode.
+            self.state.input_device.follow = False
+
             # Parse logs again in case this process was piping the output from
             # another and there are some remaining logs. Also we will be able
             # to show the end summary. If the signal is sent again, it will
@@ -159,92 +296,251 @@ class LogParser(object):
                 # log parsing but show the final summary
                 self._logger.warning("Catched SIGINT")
 
+        if self.checkpoint:
+            self._save_checkpoint()
+        if self.obfuscation_map and self.state.obfuscate:
+            self._save_obfuscation_map()
+        if self.pipeline:
+            self.pipeline.close()
         if self.originalOutput:
             self.originalOutput.close()
 
+    def _resume(self):
+        """Resume the parsing from the checkpoint if it exists."""
+        if not exists(self.checkpoint):
+            return
+        offset = load_checkpoint(self.checkpoint, self.state)
+        if offset is None:
+            self._logger.warning("The checkpoint doesn't match the input " +
+                                 "file, parsing from the start.")
+        else:
+            self.state.input_device.set_offset(offset)
+            # The salt of the checkpoint has priority.
+            self._fixed_salt = True
+            self.state.obfuscator = Obfuscator(self.state.salt)
+
+    def _load_obfuscation_map(self):
+        """Load the salt and the obfuscated names from the map file.
+
+        The salt of the map file is used if the salt is not fixed, and the
+        names warm up the cache if the salt is the same.
+        """
+        if not exists(self.obfuscation_map):
+            return
+        loaded = Obfuscator.load(self.obfuscation_map)
+        if loaded is None:
+            self._logger.warning("The obfuscation map has a different " +
+                                 "version, it is not loaded.")
+            return
+        salt, names = loaded
+        if not self._fixed_salt:
+            self.state.salt = salt
+            self.state.obfuscator = Obfuscator(salt)
+        if salt == self.state.salt:
+            self.state.obfuscator.update(names)
+        else:
+            self._logger.warning("The obfuscation map has a different " +
+                                 "salt, its names are not loaded.")
+
+    def _save_obfuscation_map(self):
+        """Save the obfuscated names and the salt into the map file."""
+        self.state.obfuscator.save(self.obfuscation_map)
+
+    def _seek_time_window(self):
+        """Skip the logs before the time range.
+
+        The offset is found in the timestamp index of the input file, and
+        the discovery logs before it are run to warm up the state.
+        """
+        device = self.state.input_device
+        if not hasattr(device, 'set_offset') or \
+                get_compression(self.state.input_file):
+            return
+
+        entries = get_index(self.state.input_file)
+        offset, lines = find_entry(entries, self._time_window[0])
+        if offset == 0:
+            return
+        warm_up(self.state.input_file, offset, self._warmup_matcher[0],
+                self.state, self._warmup_matcher[3])
+        self.state.input_line = lines
+        device.set_offset(offset)
+
+    def _save_checkpoint(self):
+        """Save the checkpoint if the input was parsed completely."""
+        if not self._completed:
+            self._logger.warning("The input was not parsed completely, " +
+                                 "the checkpoint is not saved.")
+            return
+        save_checkpoint(self.checkpoint, self.state,
+                        self.state.input_device.get_offset())
+
+    def parse_line(self, line):
+        """Parse a log line given by the caller."""
+        self.state.input_line += 1
+        self._parse_line(line)
+
     def _parse_log(self):
         """Parse a log."""
-        device = self.state['input_device']
+        if self.state.jobs > 1:
+            self._parse_log_parallel()
+            return
 
-        # While there is a new line, parse it.
-        line = ""
-        while line is not None:
-            # If the line contains non-UTF8 chars it could raise an exception.
-            self.state['input_line'] += 1
-            line = device.read_line()
+        device = self.pipeline or self.state.input_device
 
-            # Remove end of lines
-            if line:
-                line = line.rstrip("\r\n")
+        # While there are new lines, parse them. The iterator of the current
+        # batch is kept so we can continue after a KeyboardInterrupt.
+        while True:
+            for line in self._lines:
+                self.state.input_line += 1
+                self._parse_line(line)
 
-            # Remove strange character
-            if line:
-                line = line.replace("\x00", " ")
+            self._flush_output()
+            # Stop reading after the time range.
+            if self._matcher is None:
+                break
+            lines = device.read_lines()
+            if lines is None:
+                self._completed = True
+                break
+            self._lines = iter(lines)
+
+    def _parse_log_parallel(self):
+        """Parse a log file matching lines in parallel.
+
+        The lines are matched in a pool of processes and the handlers are
+        called in order from this process, so the output is the same.
+        """
+        device = self.state.input_device
+        if self._ranges is None:
+            self._ranges = match_ranges(self.state.input_file,
+                                        self.state.jobs, self.state)
+
+        # The iterator of the current range and its first line number are
+        # kept so we can continue after a KeyboardInterrupt.
+        while True:
+            for record in self._lines:
+                self._parse_record(record)
+
+            self._flush_output()
+            result = next(self._ranges, None)
+            if result is None:
+                break
+            end, (num_lines, records) = result
+            self._range_line[0] = self._range_line[1]
+            self._range_line[1] += num_lines
+            self._lines = iter(records)
+            if device.show_progress:
+                device.print_status(end)
+        self.state.input_line = self._range_line[1]
+
+    def _parse_record(self, record):
+        """Parse a line matched in parallel."""
+        number, line, clocks, position, groups, error = record
+        self.state.input_line = self._range_line[0] + number
+        if self.state.write_original:
+            self.originalOutput.write(line)
+
+        if error:
+            self._logger.error("[ScriptError] %s - log line %d" %
+                               (error, self.state.input_line))
+            return
+
+        try:
+            if clocks:
+                self._set_clocks(clocks)
+            if position is not None:
+                self.expressions[position][0](groups, self.state,
+                                              self._logger)
+        except Exception as ex:  # pylint: disable=W0703
+            self._log_script_error(ex)
+
+    def _flush_output(self):
+        """Write the buffered output, from the writer thread if any."""
+        output = self.state.output_device
+        if self.pipeline:
+            self.pipeline.put(output.flush)
+        else:
+            output.flush()
 
-            # Skip if EOF or empty line
-            if not line:
-                continue
+    def _parse_line(self, line):
+        """Parse a log line."""
+        # Remove end of lines
+        line = line.rstrip("\r\n")
 
-            # Write original log if needed
-            if self.state['write_original']:
-                self.originalOutput.write(line)
+        # Remove strange character
+        if "\x00" in line:
+            line = line.replace("\x00", " ")
 
-            # We can get exceptions if the file contains output from two
-            # different applications since the logs are messed up.
-            try:
-                self._match_line(line)
-            except Exception as ex:  # pylint: disable=W0703
-                exc_traceback = exc_info()[2]
-                stacktraces = extract_tb(exc_traceback)
-                self._logger.error(
-                    "[ScriptError] %s %s - log line %d" %
-                    (str(stacktraces[-1]), ex, self.state['input_line']))
+        # Skip if empty line
+        if not line:
+            return
+
+        # Write original log if needed
+        if self.state.write_original:
+            self.originalOutput.write(line)
+
+        # We can get exceptions if the file contains output from two
+        # different applications since the logs are messed up.
+        try:
+            self._match_line(line)
+        except Exception as ex:  # pylint: disable=W0703
+            self._log_script_error(ex)
+
+    def _log_script_error(self, ex):
+        """Log the exception raised parsing a line."""
+        exc_traceback = exc_info()[2]
+        stacktraces = extract_tb(exc_traceback)
+        self._logger.error(
+            "[ScriptError] %s %s - log line %d" %
+            (str(stacktraces[-1]), ex, self.state.input_line))
 
     def _match_line(self, line):
         """Try to match a log line with the regular expressions."""
         self._match_date(line)
-        for expr in self.expressions:
+        if self._matcher is None:
+            return
+        expressions, index, cache, logger = self._matcher
+        for expr in get_line_expressions(line, expressions, index, cache):
             match = expr[1].search(line)
             if match:
-                expr[0](match.groups(), self.state, self._logger)
+                expr[0](match.groups(), self.state, logger)
                 break
 
     def _match_date(self, line):
         """Try to match the log date."""
-        DATE_REGEX = re.compile(r'\[(\d{2}/\d{2}/\d{4} ' +
-                                r'\d{2}:\d{2}:\d{2}.\d{6})\]' +
-                                r'\[(\d{10}\.\d{6})\]')
-        SINGLE_DATE_REGEX = re.compile(r'\[(\d{10})\.(\d{6})\]')
-
-        # Try to match the two clock format.
-        clocks = DATE_REGEX.search(line)
-        two_clocks = clocks is not None
-
-        # If it doesn't match, try with the single clock format.
-        if not clocks:
-            clocks = SINGLE_DATE_REGEX.search(line)
-
-        # If we don't match the default clock either, nothing to do
-        if not clocks:
+        new_clocks = self.state.clock_decoder.decode(line)
+
+        # If we don't match any clock format, nothing to do
+        if new_clocks:
+            self._set_clocks(new_clocks)
+
+    def _set_clocks(self, new_clocks):
+        """Set the clocks of the current log line."""
+        if self._time_window:
+            self._update_time_window(new_clocks[1])
+        if self.state.clocks is not None and \
+                self._matcher is self._default_matcher:
+            self._check_time_distance(new_clocks, self.state.clocks)
+
+        self.state.clocks = new_clocks
+
+    def _update_time_window(self, system):
+        """Check if a system clock is in the time range."""
+        since, until = self._time_window
+        if self._matcher is None:
             return
-
-        # Get clocks
-        if two_clocks:
-            system = datetime.strptime(clocks.group(1), "%m/%d/%Y %H:%M:%S.%f")
-            monotonic = float(clocks.group(2))
+        elif until is not None and system > until:
+            self._matcher = None
+        elif since is not None and system < since:
+            self._matcher = self._warmup_matcher
         else:
-            system = datetime.utcfromtimestamp(int(clocks.group(1)))
-            system += timedelta(microseconds=int(clocks.group(2)))
-            monotonic = None
-
-        new_clocks = (monotonic, system)
-        if 'clocks' in self.state:
-            self._check_time_distance(new_clocks, self.state['clocks'])
-
-        self.state['clocks'] = new_clocks
+            self._matcher = self._default_matcher
 
     def write_summary(self):
         """Write results of config, errors and warnings."""
         self.formatter.write_configurations(self.state)
         self.formatter.write_warnings(self.state)
         self.formatter.write_errors(self.state)
+        self.formatter.close()
+        self.state.output_device.flush()
@@ -58,7 +58,8 @@ from __future__ import absolute_import
 from logparser.utils import (get_interface_props, get_ip, get_locator, get_oid,
                              get_port_name, get_port_number, get_topic_name,
                              get_transport_name, get_type_name, hex2ip,
-                             is_builtin_entity, parse_guid, set_local_address)
+                             is_builtin_entity, parse_guid, set_initial_peers,
+                             set_local_address)
 
 # Disable warnings about unused arguments
 # pylint: disable=W0613
@@ -71,12 +72,12 @@ def on_query_udpv4_interfaces(match, state, logger):
     """It happens when it queries the interfaces."""
     addr = get_ip(match[0], state)
     flag_name = get_interface_props(match[1])
-    logger.event("Interface: %s is %s" % (addr, flag_name[:-1]), 2)
+    logger.event("Interface: %s is %s", 2, args=(addr, flag_name[:-1]))
 
 
 def on_find_valid_interface(match, state, logger):
     """It happens when a valid interface is found."""
-    logger.cfg("Valid interface: %s" % match[0])
+    logger.cfg("Valid interface: %s", args=(match[0],))
 
 
 def on_get_valid_interface(match, state, logger):
@@ -84,14 +85,15 @@ def on_get_valid_interface(match, state, logger):
     name = match[1]
     status = "Enabled" if match[2] == "1" else "Disabled"
     multicast = "with" if match[3] == "1" else "no"
-    logger.cfg("%s interface: %s (%s multicast)" % (status, name, multicast))
+    logger.cfg("%s interface: %s (%s multicast)",
+               args=(status, name, multicast))
 
 
 def on_initialize_interface(match, state, logger):
     """It happens when initializing an interface."""
     ip = get_ip(match[0], state)
     props = get_interface_props(match[1])
-    logger.event("Initializing interface %s (%s)" % (ip, props[:-1]), 2)
+    logger.event("Initializing interface %s (%s)", 2, args=(ip, props[:-1]))
 
 
 def on_invalid_listening_port(match, state, logger):
@@ -99,8 +101,8 @@ def on_invalid_listening_port(match, state, logger):
     port = int(match[0], 16)
     port_num = get_port_number(str(port), state)
     port_name = get_port_name(port)
-    logger.event("Cannot listen on port %s (%s), probably in use" % (
-        port_num, port_name), 2)
+    logger.event("Cannot listen on port %s (%s), probably in use", 2,
+                 args=(port_num, port_name))
 
 
 def on_valid_listening_port(match, state, logger):
@@ -108,7 +110,7 @@ def on_valid_listening_port(match, state, logger):
     port = int(match[0], 16)
     port_num = get_port_number(str(port), state)
     port_name = get_port_name(port)
-    logger.event("Listening on port %s (%s)" % (port_num, port_name), 2)
+    logger.event("Listening on port %s (%s)", 2, args=(port_num, port_name))
 
 
 def on_multicast_disabled(match, state, logger):
@@ -120,9 +122,9 @@ def on_recv_buffer_size_mismatch(match, state, logger):
     """It happens when the receive socket buffer is not set."""
     expected = int(match[0])
     actual = int(match[1])
-    logger.cfg("The receive socket buffer size is %d" % actual)
+    logger.cfg("The receive socket buffer size is %d", args=(actual,))
     logger.warning("[LP-20] The OS limits the receive socket buffer " +
-                   "size from %d to %d bytes" % (expected, actual))
+                   "size from %d to %d bytes", args=(expected, actual))
 
 
 def on_msg_size_reduced(match, state, logger):
@@ -131,11 +133,12 @@ def on_msg_size_reduced(match, state, logger):
     expected = int(match[1])
     actual = int(match[2])
     rtps_overhead = int(match[3])
-    logger.warning("[LP-21] Decreased message_size_max for %s from %d to %d" %
-                   (transport, expected, actual))
-    logger.cfg("The property rtps_overhead_max is %d bytes" % rtps_overhead)
-    logger.cfg("The property message_size_max for %s is %d bytes" %
-               (transport, actual))
+    logger.warning("[LP-21] Decreased message_size_max for %s from %d to %d",
+                   args=(transport, expected, actual))
+    logger.cfg("The property rtps_overhead_max is %d bytes",
+               args=(rtps_overhead,))
+    logger.cfg("The property message_size_max for %s is %d bytes",
+               args=(transport, actual))
 
 
 def on_set_default_initial_peers(match, state, logger):
@@ -154,11 +157,9 @@ def on_set_default_initial_peers(match, state, logger):
 # --------------------------------------------------------------------------- #
 def on_new_thread(match, state, logger):
     """It happens when a new middleware thread is created."""
-    if 'threads' not in state:
-        state['threads'] = {}
-    if 'all' not in state['threads']:
-        state['threads']['all'] = 0
-    state['threads']['all'] += 1
+    if 'all' not in state.threads:
+        state.threads['all'] = 0
+    state.threads['all'] += 1
 
 
 def on_new_thread_with_config(match, state, logger):
@@ -168,9 +169,7 @@ def on_new_thread_with_config(match, state, logger):
     priority = int(match[2])
     stack_size = int(match[3], 16)
 
-    if "threads" not in state:
-        state['threads'] = {}
-    state['threads'][name] = {
+    state.threads[name] = {
         'name': name,
         'kind': kind,
         'priority': priority,
@@ -184,22 +183,20 @@ def on_new_thread_affinity(match, state, logger):
     name = match[0]
     tid = int(match[1])
     affinity = match[2]
-    if "threads" not in state:
-        state['threads'] = {}
-    if name not in state['threads']:
-        state['threads'][name] = {
+    if name not in state.threads:
+        state.threads[name] = {
             'name': name,
             'kind': 'unknown',
             'priority': -1,
             'stack_size': -1}
-    state['threads'][name]['tid'] = tid
-    state['threads'][name]['affinity'] = affinity
+    state.threads[name]['tid'] = tid
+    state.threads[name]['affinity'] = affinity
 
 
 def on_create_participant(match, state, logger):
     """It happens for new participants."""
-    logger.event("Created participant, domain: %3s index: %s" %
-                 (match[0], match[1]))
+    logger.event("Created participant, domain: %3s index: %s",
+                 args=(match[0], match[1]))
 
 
 def on_enable_participant(match, state, logger):
@@ -209,35 +206,34 @@ def on_enable_participant(match, state, logger):
 
 def on_delete_participant(match, state, logger):
     """It happens for deleted participants."""
-    logger.event("Deleted participant, domain: %3s index: %s" %
-                 (match[0], match[1]))
+    logger.event("Deleted participant, domain: %3s index: %s",
+                 args=(match[0], match[1]))
 
 
 def on_create_topic(match, state, logger):
     """It happens for new topics."""
     topic = get_topic_name(match[0], state)
     typ = get_type_name(match[1], state)
-    logger.event("Created topic, name: '%s', type: '%s'" %
-                 (topic, typ))
+    logger.event("Created topic, name: '%s', type: '%s'", args=(topic, typ))
 
 
 def on_create_cft(match, state, logger):
     """It happens for new CFT."""
     topic = get_topic_name(match[0], state)
-    logger.event("Created ContentFilteredTopic, name: '%s'" % topic)
+    logger.event("Created ContentFilteredTopic, name: '%s'", args=(topic,))
 
 
 def on_create_builtin_topic(match, state, logger):
     """It happens for new builtin topics."""
     topic = match[0]
-    logger.event("Created built-in topic '%s'" % topic)
+    logger.event("Created built-in topic '%s'", args=(topic,))
 
 
 def on_delete_topic(match, state, logger):
     """It happens for deleted topics."""
     topic = get_topic_name(match[0], state)
     typ = get_type_name(match[1], state)
-    logger.event("Deleted topic, name: '%s', type: '%s'" % (topic, typ), 1)
+    logger.event("Deleted topic, name: '%s', type: '%s'", 1, args=(topic, typ))
 
 
 def on_enable_topic(match, state, logger):
@@ -268,7 +264,7 @@ def on_enable_subscriber(match, state, logger):
 def on_create_writer(match, state, logger):
     """It happens for new DataWriters."""
     topic = get_topic_name(match[0], state)
-    logger.event("Created writer for topic '%s'" % topic)
+    logger.event("Created writer for topic '%s'", args=(topic,))
 
 
 def on_enable_writer(match, state, logger):
@@ -279,13 +275,13 @@ def on_enable_writer(match, state, logger):
 def on_create_reader(match, state, logger):
     """It happens for new DataReader."""
     topic = get_topic_name(match[0], state)
-    logger.event("Created reader for topic '%s'" % topic)
+    logger.event("Created reader for topic '%s'", args=(topic,))
 
 
 def on_create_builtin_reader(match, state, logger):
     """It happens for new builtin DataReaders."""
     topic = match[0]
-    logger.event("Created built-on reader for topic '%s'" % topic)
+    logger.event("Created built-on reader for topic '%s'", args=(topic,))
 
 
 def on_enable_reader(match, state, logger):
@@ -296,34 +292,35 @@ def on_enable_reader(match, state, logger):
 def on_delete_writer(match, state, logger):
     """It happens for deleted DataWriters."""
     topic = get_topic_name(match[0], state)
-    logger.event("Deleted writer for topic '%s'" % topic)
+    logger.event("Deleted writer for topic '%s'", args=(topic,))
 
 
 def on_delete_reader(match, state, logger):
     """It happens for deleted DataReaders."""
     topic = get_topic_name(match[0], state)
-    logger.event("Deleted reader for topic '%s'" % topic)
+    logger.event("Deleted reader for topic '%s'", args=(topic,))
 
 
 def on_duplicate_topic_name_error(match, state, logger):
     """It happens when there is a topic name duplication."""
     topic = get_topic_name(match[0], state)
-    logger.event("[LP-2] Topic name already in use by another topic: %s"
-                 % topic)
+    logger.event("[LP-2] Topic name already in use by another topic: %s",
+                 args=(topic,))
 
 
 def on_delete_topic_before_cft(match, state, logger):
     """It happens when deleting a topic before its CFT."""
     num_cft = match[0]
-    logger.error("[LP-7] Cannot delete topic before its %s" % num_cft +
-                 "ContentFilteredTopics")
+    logger.error("[LP-7] Cannot delete topic before its %s" +
+                 "ContentFilteredTopics", args=(num_cft,))
 
 
 def on_fail_delete_flowcontrollers(match, state, logger):
     """It happens when delete FC fails."""
     num_flowcontrol = match[0]
-    logger.error("[LP-15] Cannot delete %s " % (num_flowcontrol) +
-                 "FlowControllers from delete_contained_entities")
+    logger.error("[LP-15] Cannot delete %s " +
+                 "FlowControllers from delete_contained_entities",
+                 args=(num_flowcontrol,))
 
 
 def on_invalid_transport_discovery(match, state, logger):
@@ -344,8 +341,8 @@ def on_discover_participant(match, state, logger):
     local_address = parse_guid(state, match[0], match[1])
     full_addr = parse_guid(state, match[0], match[1], match[2])
     full_addr = " ".join(full_addr.split())
-    logger.process(local_address, "", "Discovered new participant (%s)" %
-                   full_addr)
+    logger.process(local_address, "", "Discovered new participant (%s)",
+                   args=(full_addr,))
 
 
 def on_update_remote_participant(match, state, logger):
@@ -355,8 +352,7 @@ def on_update_remote_participant(match, state, logger):
     full_addr = " ".join(full_addr.split())
     part_oid = " " + get_oid(match[3]) if len(match) == 4 else ""
     logger.process(remote_address, "",
-                   "Assert participant (%s%s)"
-                   % (full_addr, part_oid), 1)
+                   "Assert participant (%s%s)", 1, args=(full_addr, part_oid))
 
 
 def on_accept_remote_participant(match, state, logger):
@@ -366,8 +362,8 @@ def on_accept_remote_participant(match, state, logger):
     full_addr = " ".join(full_addr.split())
     part_oid = get_oid(match[3])
     logger.process(remote_address, "",
-                   "Accepted participant (%s %s)"
-                   % (full_addr, part_oid), 1)
+                   "Accepted participant (%s %s)", 1,
+                   args=(full_addr, part_oid))
 
 
 def on_announce_local_participant(match, state, logger):
@@ -381,7 +377,7 @@ def on_discover_publication(match, state, logger):
     remote_addr = parse_guid(state, match[0], match[1], match[2])
     pub_oid = get_oid(match[3])
     logger.process(remote_addr, "",
-                   "Discovered new writer %s" % pub_oid)
+                   "Discovered new writer %s", args=(pub_oid,))
 
 
 def on_discover_subscription(match, state, logger):
@@ -389,7 +385,7 @@ def on_discover_subscription(match, state, logger):
     remote_addr = parse_guid(state, match[0], match[1], match[2])
     sub_oid = get_oid(match[3])
     logger.process(remote_addr, "",
-                   "Discovered new reader %s" % sub_oid)
+                   "Discovered new reader %s", args=(sub_oid,))
 
 
 def on_update_endpoint(match, state, logger):
@@ -397,35 +393,37 @@ def on_update_endpoint(match, state, logger):
     remote_addr = parse_guid(state, match[0], match[1], match[2])
     pub_oid = get_oid(match[3])
     logger.process(remote_addr, "",
-                   "Assert entity %s" % pub_oid, 1)
+                   "Assert entity %s", 1, args=(pub_oid,))
 
 
 def on_announce_local_publication(match, state, logger):
     """It happens when announcing a writer."""
     local_addr = parse_guid(state, match[0], match[1], match[2])
     pub_oid = get_oid(match[3])
-    logger.process(local_addr, "", "Announcing new writer %s" % pub_oid)
+    logger.process(local_addr, "", "Announcing new writer %s", args=(pub_oid,))
 
 
 def on_announce_local_publication_sed(match, state, logger):
     """It happens when announcing a writer."""
     local_addr = parse_guid(state, match[0], match[1], match[2])
     pub_oid = get_oid(match[3])
-    logger.process(local_addr, "", "Announcing new writer %s" % pub_oid, 2)
+    logger.process(local_addr, "", "Announcing new writer %s", 2,
+                   args=(pub_oid,))
 
 
 def on_announce_local_subscription(match, state, logger):
     """It happens when announcing a reader."""
     local_addr = parse_guid(state, match[0], match[1], match[2])
     sub_oid = get_oid(match[3])
-    logger.process(local_addr, "", "Announcing new reader %s" % sub_oid)
+    logger.process(local_addr, "", "Announcing new reader %s", args=(sub_oid,))
 
 
 def on_announce_local_subscription_sed(match, state, logger):
     """It happens when announcing a reader too."""
     local_addr = parse_guid(state, match[0], match[1], match[2])
     sub_oid = get_oid(match[3])
-    logger.process(local_addr, "", "Announcing new reader %s" % sub_oid, 2)
+    logger.process(local_addr, "", "Announcing new reader %s", 2,
+                   args=(sub_oid,))
 
 
 def on_participant_ignore_itself(match, state, logger):
@@ -439,22 +437,23 @@ def on_lose_discovery_samples(match, state, logger):
     entity_oid = get_oid(match[1])
     total = match[2]
     delta = match[3]
-    logger.warning("%s discovery samples lost for %s %s (%s in total)" %
-                   (delta, entity_type, entity_oid, total))
+    logger.warning("%s discovery samples lost for %s %s (%s in total)",
+                   args=(delta, entity_type, entity_oid, total))
 
 
 def on_cannot_reach_multicast(match, state, logger):
     """It happens when a multicast locator cannot be reached."""
     transport = get_transport_name(match[1])
-    logger.warning("[LP-12] Transport %s discovered entity " % transport +
-                   r"using a non-addressable multicast locator", 2)
+    logger.warning("[LP-12] Transport %s discovered entity " +
+                   r"using a non-addressable multicast locator", 2,
+                   args=(transport,))
 
 
 def on_ignore_participant(match, state, logger):
     """It happens when the user ignores a participant."""
     guid = parse_guid(state, match[0], match[1], match[2])
     oid = get_oid(match[3])
-    logger.process("", "", "Ignored %s %s" % (oid.lower(), guid))
+    logger.process("", "", "Ignored %s %s", args=(oid.lower(), guid))
 
 
 # --------------------------------------------------------------------------- #
@@ -469,9 +468,8 @@ def on_match_entity(entity2, kind):
         entity1_oid = get_oid(match[4])
         verb = 1 if is_builtin_entity(match[4]) else 0
         reliable = match[5]  # Best-Effort or Reliable
-        logger.process(entity2_addr, entity1_oid, "Discovered %s %s %s %s" %
-                       (kind, reliable, entity2, entity2_oid),
-                       verb)
+        logger.process(entity2_addr, entity1_oid, "Discovered %s %s %s %s",
+                       verb, args=(kind, reliable, entity2, entity2_oid))
     return match_entity
 
 
@@ -480,14 +478,14 @@ def on_different_type_names(match, state, logger):
     topic = get_topic_name(match[0], state)
     type1 = get_type_name(match[1], state)
     type2 = get_type_name(match[2], state)
-    logger.error("[LP-18] Cannot match remote entity in topic '%s': "
-                 % (topic) + "Different type names found ('%s', '%s')"
-                 % (type1, type2))
+    logger.error("[LP-18] Cannot match remote entity in topic '%s': " +
+                 "Different type names found ('%s', '%s')",
+                 args=(topic, type1, type2))
 
 
 def on_typeobject_received(match, state, logger):
     """It happens for discovered entities when comparing TypeObjects."""
-    logger.process("", "", "TypeObject %s" % match[0], 2)
+    logger.process("", "", "TypeObject %s", 2, args=(match[0],))
 
 
 def on_reader_incompatible_durability(match, state, logger):
@@ -495,8 +493,9 @@ def on_reader_incompatible_durability(match, state, logger):
     DURABILITY = ["Volatile", "TransientLocal", "Transient", "Persistent"]
     writer_qos = DURABILITY[int(match[0])]
     reader_qos = DURABILITY[int(match[1])]
-    logger.error("Durability QoS for local reader (%s) " % (reader_qos) +
-                 "is incompatible with remote writer (%s)" % (writer_qos))
+    logger.error("Durability QoS for local reader (%s) " +
+                 "is incompatible with remote writer (%s)",
+                 args=(reader_qos, writer_qos))
 
 
 # --------------------------------------------------------------------------- #
@@ -522,21 +521,21 @@ def on_unregister_unkeyed_instance(match, state, logger):
 # --------------------------------------------------------------------------- #
 def on_library_version(match, state, logger):
     """It happens for the library version."""
-    logger.cfg("Version of %s is %s" % (match[0], match[1]))
+    logger.cfg("Version of %s is %s", args=(match[0], match[1]))
 
 
 def on_participant_initial_peers(match, state, logger):
     """It happens for the initial peers."""
     initial_peers = [get_locator(peer, state) for peer in match[0].split(",")]
-    state['initial_peers'] = initial_peers
-    logger.cfg("Initial peers: %s" % ", ".join(initial_peers))
+    set_initial_peers(initial_peers, state)
+    logger.cfg("Initial peers: %s", args=(", ".join(initial_peers),))
 
 
 def on_envvar_file_not_found(match, state, logger):
     """It happens when the middleware cannot find an env var or file."""
-    logger.cfg("%s %s not found" % (match[0].capitalize(), match[1]))
+    logger.cfg("%s %s not found", args=(match[0].capitalize(), match[1]))
 
 
 def on_envvar_file_found(match, state, logger):
     """It happens when the middleware found an env var or file."""
-    logger.cfg("%s %s found" % (match[0].capitalize(), match[1]))
+    logger.cfg("%s %s found", args=(match[0].capitalize(), match[1]))
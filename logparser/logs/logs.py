@@ -18,21 +18,66 @@
 Functions:
   + add_regex: Compile the regex and add it to the list.
   + create_regex_list: Create the list of regular expressions and functions.
+  + get_dispatch_key: Get the function name that prefixes a regex if any.
+  + create_regex_index: Group the regular expressions by function name.
+  + get_line_expressions: Get the regular expressions to try for a log line.
+  + create_line_prefilter: Create a filter of raw lines that may match.
+  + create_warmup_regex_list: Get the expressions of the discovery logs.
+
+Constants:
+  + DISPATCH_KEY_REGEX: Match the function name that prefixes a regex.
+  + LINE_KEYS_REGEX: Match the candidate function names of a log line.
+  + LINE_KEYS_BYTES_REGEX: Same as LINE_KEYS_REGEX for raw lines.
+  + WARMUP_FUNCTIONS: Functions of the discovery logs that create names.
 """
 from __future__ import absolute_import
 import re
 from logparser.logs.custom.logs import get_regex_list as custom_regex
 from logparser.logs.debug.logs import get_regex_list as debug_regex
+from logparser.logs.events import events
 from logparser.logs.events.logs import get_regex_list as events_regex
 from logparser.logs.micro.logs import get_regex_list as micro_regex
 from logparser.logs.micro.micro import init as init_micro
 from logparser.logs.network.logs import get_regex_list as network_regex
 from logparser.logs.routing.logs import get_regex_list as routing_regex
 
+DISPATCH_KEY_REGEX = re.compile(r"([A-Za-z_]\w*):")
+LINE_KEYS_REGEX = re.compile(r"(\w+):")
+LINE_KEYS_BYTES_REGEX = re.compile(br"(\w+):")
+WARMUP_FUNCTIONS = frozenset([
+    events.on_participant_initial_peers,
+    events.on_discover_participant,
+    events.on_update_remote_participant,
+    events.on_accept_remote_participant,
+    events.on_announce_local_participant,
+    events.on_discover_publication,
+    events.on_discover_subscription,
+    events.on_update_endpoint,
+    events.on_announce_local_publication,
+    events.on_announce_local_publication_sed,
+    events.on_announce_local_subscription,
+    events.on_announce_local_subscription_sed])
+
 
 def add_regex(log_list, method, regex):
-    """Compile the regex and add it to the list."""
-    log_list.append((method, re.compile(regex)))
+    """Compile the regex and add it to the list.
+
+    Each item of the list is a tuple with the function to call, the compiled
+    regex, the dispatch key and the position in the list.
+    """
+    log_list.append((method, re.compile(regex), get_dispatch_key(regex),
+                     len(log_list)))
+
+
+def get_dispatch_key(regex):
+    """Get the function name that prefixes a regex if any.
+
+    Most of the Connext logs start with the name of the function that
+    generated the message (e.g.: 'COMMENDSrWriterService_write:'). Only the
+    regex that start with a literal name can be indexed by it.
+    """
+    match = DISPATCH_KEY_REGEX.match(regex)
+    return match.group(1) if match else None
 
 
 def create_regex_list(state):
@@ -51,3 +96,72 @@ def create_regex_list(state):
         [add_regex(expressions, expr[0], expr[1]) for expr in debug_regex()]
 
     return expressions
+
+
+def create_regex_index(expressions):
+    """Group the regular expressions by function name.
+
+    Returns a dictionary that maps each function name to the list of
+    expressions to try. The expressions without function name are under the
+    None key and they are added to every list. Every list keeps the original
+    order so the first matching expression is the same as with a linear scan.
+    """
+    index = {None: [expr for expr in expressions if expr[2] is None]}
+    for expr in expressions:
+        if expr[2] not in index:
+            index[expr[2]] = [e for e in expressions
+                              if e[2] is None or e[2] == expr[2]]
+    return index
+
+
+def get_line_expressions(line, expressions, index, cache):
+    """Get the regular expressions to try for a log line.
+
+    The cache dictionary keeps the merged lists for lines that contain more
+    than one indexed function name.
+    """
+    keys = tuple(key for key in LINE_KEYS_REGEX.findall(line) if key in index)
+    if not keys:
+        return index[None]
+    elif len(keys) == 1:
+        return index[keys[0]]
+
+    if keys not in cache:
+        cache[keys] = [expr for expr in expressions
+                       if expr[2] is None or expr[2] in keys]
+    return cache[keys]
+
+
+def create_line_prefilter(expressions):
+    """Create a filter of raw lines that may match.
+
+    The filter is a function that takes a bytes-like buffer and the start
+    and end offsets of a line. It returns False only if the line cannot
+    match any of the regular expressions, so it can be skipped before
+    decoding it.
+    """
+    keys = set(expr[2].encode("ascii") for expr in expressions
+               if expr[2] is not None)
+    fallback = [re.compile(expr[1].pattern.encode("utf-8"))
+                for expr in expressions if expr[2] is None]
+
+    def prefilter(buff, start, end):
+        """Return if the raw line may match any regular expression."""
+        for key in LINE_KEYS_BYTES_REGEX.findall(buff, start, end):
+            if key in keys:
+                return True
+        for regex in fallback:
+            if regex.search(buff, start, end):
+                return True
+        return False
+    return prefilter
+
+
+def create_warmup_regex_list(expressions):
+    """Get the expressions of the discovery logs.
+
+    These logs create the names of the hosts, applications and participants
+    and the initial peers, so they are enough to warm up the state before
+    parsing part of a log.
+    """
+    return [expr for expr in expressions if expr[0] in WARMUP_FUNCTIONS]
@@ -53,13 +53,23 @@ Functions:
   + on_sample_received_from_deleted_writer: it happens when no remote writer.
   + on_deserialize_failure: it happens when deserialization fails.
   + on_shmem_queue_full: it happens when the SharedMemory queue is full.
+
+Constants:
+  + MAX_RECEIVED_RANGES: Maximum number of ranges of received samples kept
+    for each pair of reader and writer.
+  + MAX_RECEIVED_PAIRS: Maximum number of pairs of reader and writer with
+    received samples.
 """
 from __future__ import absolute_import
+from logparser.rangeset import RangeSet
 from logparser.utils import (add_statistics_bandwidth, add_statistics_packet,
                              get_data_packet_name, get_locator, get_oid,
                              get_participant, get_port_name, get_port_number,
                              hex2ip, is_builtin_entity, parse_guid, parse_sn)
 
+MAX_RECEIVED_RANGES = 16
+MAX_RECEIVED_PAIRS = 1024
+
 # Disable warnings about unused arguments
 # pylint: disable=W0613
 
@@ -70,7 +80,7 @@ from logparser.utils import (add_statistics_bandwidth, add_statistics_packet,
 def on_parse_packet(match, state, logger):
     """It happens when an RTPS message is parsed."""
     addr = parse_guid(state, match[1], match[2])
-    logger.recv(addr, "", "Received %s packet" % match[0], 2)
+    logger.recv(addr, "", "Received %s packet", 2, args=(match[0],))
     add_statistics_packet(addr, 'receive', match[0], state)
 
 
@@ -83,7 +93,7 @@ def on_udpv4_send(match, state, logger):
     addr = get_participant(hex2ip(match[1], True), state)
     port = get_port_name(int(match[2]))
     addr += ":(%s)" % port
-    logger.send(addr, "", "Sent %s bytes" % qty, 2)
+    logger.send(addr, "", "Sent %s bytes", 2, args=(qty,))
     add_statistics_bandwidth(addr, 'send', qty, state)
 
 
@@ -93,7 +103,7 @@ def on_udpv4_receive(match, state, logger):
     addr = get_participant(hex2ip(match[1], True), state)
     port = get_port_number(match[2], state)
     addr += ":" + port.zfill(5)
-    logger.recv(addr, "", "Received %d bytes" % qty, 2)
+    logger.recv(addr, "", "Received %d bytes", 2, args=(qty,))
     add_statistics_bandwidth(addr, 'receive', qty, state)
 
 
@@ -106,7 +116,7 @@ def on_shmem_send(match, state, logger):
 def on_shmem_receive(match, state, logger):
     """It happens when receiving an RTPS packet through SharedMemory."""
     qty = int(match[0])
-    logger.recv("SHMEM", "", "Received %d bytes" % qty, 2)
+    logger.recv("SHMEM", "", "Received %d bytes", 2, args=(qty,))
     add_statistics_bandwidth("SHMEM", 'receive', qty, state)
 
 
@@ -118,8 +128,8 @@ def on_error_unreachable_network(match, state, logger):
 def on_error_no_transport_available(match, state, logger):
     """It happens when there isn't transport."""
     loc = get_locator(match[0], state)
-    logger.warning("[LP-12] No transport available to reach locator %s" % loc,
-                   1)
+    logger.warning("[LP-12] No transport available to reach locator %s",
+                   1, args=(loc,))
 
 
 # --------------------------------------------------------------------------- #
@@ -131,9 +141,9 @@ def on_unregister_not_asserted_entity(entity):
         """Internal function for the specific entity."""
         remote_part = parse_guid(state, match[0], match[1], match[2])
         remote_oid = get_oid(match[3])
-        logger.warning("%s %s is unregistering " % (remote_part, remote_oid) +
-                       "remote %s not previously asserted" % entity,
-                       2)
+        logger.warning("%s %s is unregistering " +
+                       "remote %s not previously asserted",
+                       2, args=(remote_part, remote_oid, entity))
     return on_unregister_given_not_asserted_entity
 
 
@@ -141,7 +151,8 @@ def on_send_participant_announcement(match, state, logger):
     """It happens when sending participant announcements."""
     addr = parse_guid(state, match[0], match[1], match[2])
     part_oid = get_oid(match[3])
-    logger.send("", part_oid, "Sent participant announcement for %s" % addr, 1)
+    logger.send("", part_oid, "Sent participant announcement for %s", 1,
+                args=(addr,))
 
 
 # --------------------------------------------------------------------------- #
@@ -151,27 +162,27 @@ def on_schedule_data(match, state, logger):
     """It happens when a data is asynchronously scheduled."""
     writer_oid = get_oid(match[0])
     seqnum = parse_sn(match[1])
-    logger.process("", writer_oid, "Scheduled DATA [%d]" % seqnum)
+    logger.process("", writer_oid, "Scheduled DATA [%d]", args=(seqnum,))
 
-    if 'packets_lost' not in state:
-        state['packets_lost'] = []
-    key = writer_oid + "-" + str(seqnum)
-    if key in state['packets_lost']:
-        state['packets_lost'].remove(key)
-    else:
-        state['packets_lost'].append(key)
+    # Toggle the sample in the set of pending samples of the writer until
+    # it's sent.
+    pending = state.packets_lost.get(writer_oid)
+    if pending is None:
+        pending = state.packets_lost[writer_oid] = RangeSet()
+    if not pending.discard(seqnum):
+        pending.add(seqnum)
 
 
 def on_send_data(match, state, logger):
     """It happens when a DATA packet is sent."""
     writer_oid = get_oid(match[0])
     seqnum = parse_sn(match[1])
-    logger.send("", writer_oid, "Sent DATA [%d]" % seqnum)
+    logger.send("", writer_oid, "Sent DATA [%d]", args=(seqnum,))
     add_statistics_packet(writer_oid, "send", "DATA", state)
 
-    key = writer_oid + "-" + str(seqnum)
-    if 'packets_lost' in state and key in state['packets_lost']:
-        state['packets_lost'].remove(key)
+    pending = state.packets_lost.get(writer_oid)
+    if pending is not None:
+        pending.discard(seqnum)
 
 
 def on_resend_data(match, state, logger):
@@ -183,9 +194,8 @@ def on_resend_data(match, state, logger):
     seqnum = parse_sn(match[5])
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send(remote_part, writer_oid,
-                "Resent %s [%d] to reader %s"
-                % (packet_name, seqnum, remote_oid),
-                verb)
+                "Resent %s [%d] to reader %s",
+                verb, args=(packet_name, seqnum, remote_oid))
 
 
 def on_send_periodic_data(match, state, logger):
@@ -197,9 +207,8 @@ def on_send_periodic_data(match, state, logger):
     data_name = get_data_packet_name(key[24:32])
     verb = 1 if is_builtin_entity(key[24:32]) else 0
     logger.send("", oid,
-                "Sent periodic %s [%d] for %s" %
-                (data_name, seqnum, local_part),
-                verb)
+                "Sent periodic %s [%d] for %s",
+                verb, args=(data_name, seqnum, local_part))
 
 
 def on_send_gap(match, state, logger):
@@ -211,8 +220,8 @@ def on_send_gap(match, state, logger):
     sn_end = parse_sn(match[6]) - 1
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send(remote_part, writer_oid,
-                "Sent GAP to reader %s for samples in [%d, %d]" %
-                (reader_oid, sn_start, sn_end), verb)
+                "Sent GAP to reader %s for samples in [%d, %d]", verb,
+                args=(reader_oid, sn_start, sn_end))
     add_statistics_packet(writer_oid, 'send', 'GAP', state)
 
     # Check for large sequence number issues.
@@ -220,18 +229,14 @@ def on_send_gap(match, state, logger):
         logger.warning("[LP-1] Large Sequence Number difference in GAP")
 
     # Check for reliable packet lost
-    if 'packets_lost' not in state:
+    pending = state.packets_lost.get(writer_oid)
+    if pending is None:
         return
-    losts = []
-    for k in state['packets_lost']:
-        info = k.split("-")
-        oid = info[0]
-        seqnum = int(info[1])
-        if oid == writer_oid and seqnum >= sn_start and seqnum < sn_end:
-            logger.warning("DATA [%d] may have been lost" % seqnum)
-            losts.append(k)
-    for k in losts:
-        state['packets_lost'].remove(k)
+    for first, last in pending.remove_range(sn_start, sn_end):
+        for seqnum in range(first, last):
+            logger.warning("DATA [%d] may have been lost", args=(seqnum,))
+    if not pending:
+        del state.packets_lost[writer_oid]
 
 
 def on_send_preemptive_gap(match, state, logger):
@@ -241,8 +246,8 @@ def on_send_preemptive_gap(match, state, logger):
     reader_oid = get_oid(match[4])
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send(reader_addr, writer_oid,
-                "Sent preemptive GAP to volatile reader %s" % (reader_oid),
-                verb)
+                "Sent preemptive GAP to volatile reader %s",
+                verb, args=(reader_oid,))
 
 
 def on_send_preemptive_hb(match, state, logger):
@@ -253,9 +258,8 @@ def on_send_preemptive_hb(match, state, logger):
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("",
                 writer_oid,
-                "Sent preemptive HB to let know about samples in [%d, %d]" %
-                (sn_start, sn_end),
-                verb)
+                "Sent preemptive HB to let know about samples in [%d, %d]",
+                verb, args=(sn_start, sn_end))
 
 
 def on_send_periodic_hb(match, state, logger):
@@ -266,9 +270,8 @@ def on_send_periodic_hb(match, state, logger):
     epoch = int(match[3])
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("", writer_oid,
-                "Sent periodic HB [%d] for samples in [%d, %d]" %
-                (epoch, sn_start, sn_end),
-                verb)
+                "Sent periodic HB [%d] for samples in [%d, %d]",
+                verb, args=(epoch, sn_start, sn_end))
 
 
 def on_send_piggyback_hb(match, state, logger):
@@ -278,8 +281,8 @@ def on_send_piggyback_hb(match, state, logger):
     sn_last = parse_sn(match[2])
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("", writer_oid,
-                "Sent piggyback HB to acknowledge samples in [%d, %d]" %
-                (sn_first, sn_last), verb)
+                "Sent piggyback HB to acknowledge samples in [%d, %d]", verb,
+                args=(sn_first, sn_last))
     add_statistics_packet(writer_oid, "send", "PIGGYBACK HB", state)
 
 
@@ -292,10 +295,9 @@ def on_send_piggyback_hb_syncrepair(match, state, logger):
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("",
                 writer_oid,
-                ("Sent piggyback HB [%d] from synchronous reparation"
-                 % epoch) + " to acknowledge samples in [%d, %d]"
-                % (sn_first, sn_last),
-                verb)
+                "Sent piggyback HB [%d] from synchronous reparation" +
+                " to acknowledge samples in [%d, %d]",
+                verb, args=(epoch, sn_first, sn_last))
     add_statistics_packet(writer_oid, "send", "PIGGYBACK HB", state)
 
 
@@ -308,9 +310,8 @@ def on_send_hb_response(match, state, logger):
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("",
                 writer_oid,
-                "Sent HB [%d] to verify GAP for samples in [%d, %d]" %
-                (epoch, sn_start, sn_end),
-                verb)
+                "Sent HB [%d] to verify GAP for samples in [%d, %d]",
+                verb, args=(epoch, sn_start, sn_end))
 
 
 def on_receive_ack(match, state, logger):
@@ -325,9 +326,8 @@ def on_receive_ack(match, state, logger):
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.recv(reader_addr,
                 writer_oid,
-                "Received ACKNACK [%d] from reader %s for %d +%d" %
-                (epoch, reader_oid, seqnum, bitcount),
-                verb)
+                "Received ACKNACK [%d] from reader %s for %d +%d",
+                verb, args=(epoch, reader_oid, seqnum, bitcount))
 
 
 def on_instance_not_found(match, state, logger):
@@ -395,25 +395,39 @@ def on_receive_data(match, state, logger):
     packet = get_data_packet_name(remote[3]) if packet == "DATA" else packet
 
     # Sequece number check
-    full_id = writer_addr + "." + writer_oid + ' to ' + reader_oid
-    if 'last_sn' not in state:
-        state['last_sn'] = {}
-    if full_id in state['last_sn']:
-        prev_seqnum = state['last_sn'][full_id]
-        diff = seqnum - prev_seqnum
-        # Add a warning message per missing packet to have a good count in
-        # the warning summary.
-        for _ in range(diff - 1):
-            logger.warning("Missing sample from %s" % full_id)
-    if full_id not in state['last_sn'] or state['last_sn'][full_id] < seqnum:
-        state['last_sn'][full_id] = seqnum
+    writer_id = writer_addr + "." + writer_oid
+    # Move the pair to the end, so the least recently used is the first.
+    pair = (writer_id, reader_oid)
+    received = state.received_sn.pop(pair, None)
+    if received is None:
+        received = RangeSet()
+        if len(state.received_sn) >= MAX_RECEIVED_PAIRS:
+            state.received_sn.popitem(last=False)
+    state.received_sn[pair] = received
+    full_id = writer_id + ' to ' + reader_oid
+    builtin = is_builtin_entity(remote[3])
+    last_seqnum = received.last()
+    if seqnum in received:
+        # The built-in writers send the participant announcements again.
+        if not builtin:
+            logger.warning("Duplicated sample from %s", args=(full_id,))
+    elif received.floor is None or seqnum >= received.floor:
+        # The samples below the floor are not tracked anymore, so they may
+        # be repairs or duplicated samples.
+        if last_seqnum is not None:
+            # Add a warning message per missing packet to have a good count
+            # in the warning summary.
+            for _ in range(seqnum - last_seqnum - 1):
+                logger.warning("Missing sample from %s", args=(full_id,))
+        received.add(seqnum)
+        # The old missing samples were already reported.
+        received.drop_first(MAX_RECEIVED_RANGES)
 
     # Show the message after any possible warning.
-    verb = 1 if is_builtin_entity(remote[3]) else 0
+    verb = 1 if builtin else 0
     logger.recv(writer_addr, reader_oid,
-                "Received %s [%d] from writer %s (%s)" %
-                (packet, seqnum, writer_oid, comm),
-                verb)
+                "Received %s [%d] from writer %s (%s)",
+                verb, args=(packet, seqnum, writer_oid, comm))
 
 
 def on_receive_fragment(match, state, logger):
@@ -423,8 +437,8 @@ def on_receive_fragment(match, state, logger):
     frag_end = int(match[2])
     seqnum = parse_sn(match[3])
     logger.recv("", reader_oid,
-                "Received DATA fragments %d to %d for sample %d" %
-                (frag_start, frag_end, seqnum))
+                "Received DATA fragments %d to %d for sample %d",
+                args=(frag_start, frag_end, seqnum))
 
 
 def on_complete_fragment(match, state, logger):
@@ -432,7 +446,7 @@ def on_complete_fragment(match, state, logger):
     reader_oid = get_oid(match[0])
     seqnum = parse_sn(match[1])
     logger.process("", reader_oid,
-                   "Fragmented sample %d is complete" % seqnum)
+                   "Fragmented sample %d is complete", args=(seqnum,))
 
 
 def on_receive_out_order_data(match, state, logger):
@@ -445,22 +459,21 @@ def on_receive_out_order_data(match, state, logger):
     writer_oid = get_oid(remote[3])
     packet_name = get_data_packet_name(remote[3])
     verb = 1 if is_builtin_entity(remote[3]) else 0
-    logger.recv(writer_addr, reader_oid, "Received %s %s [%d] from writer %s" %
-                (kind, packet_name, seqnum, writer_oid),
-                verb)
+    logger.recv(writer_addr, reader_oid, "Received %s %s [%d] from writer %s",
+                verb, args=(kind, packet_name, seqnum, writer_oid))
 
 
 def on_accept_data(match, state, logger):
     """It happens when the reader accepts data."""
     seqnum = parse_sn(match[0])
-    logger.process("", "", "Reader accepted DATA (%d)" % seqnum, 1)
+    logger.process("", "", "Reader accepted DATA (%d)", 1, args=(seqnum,))
 
 
 def on_rejected_data(match, state, logger):
     """It happens when the reader rejects data."""
     seqnum = parse_sn(match[0])
-    logger.process("", "", "Reader rejected DATA (%d)" % seqnum)
-    logger.warning("A DataReader rejected sample %d" % seqnum)
+    logger.process("", "", "Reader rejected DATA (%d)", args=(seqnum,))
+    logger.warning("A DataReader rejected sample %d", args=(seqnum,))
 
 
 def on_receive_hb(match, state, logger):
@@ -476,9 +489,8 @@ def on_receive_hb(match, state, logger):
     verb = 1 if is_builtin_entity(remote[3]) else 0
     logger.recv(writer_addr,
                 reader_oid,
-                "Received %s [%d] from writer %s for samples in [%d, %d]" %
-                (packet, epoch, writer_oid, sn_start, sn_end),
-                verb)
+                "Received %s [%d] from writer %s for samples in [%d, %d]",
+                verb, args=(packet, epoch, writer_oid, sn_start, sn_end))
 
 
 def on_received_gap(match, state, logger):
@@ -493,9 +505,8 @@ def on_received_gap(match, state, logger):
     verb = 1 if is_builtin_entity(remote[3]) else 0
     logger.recv(writer_addr,
                 reader_oid,
-                "Received GAP from writer %s for [%d, %d] (+%d)" %
-                (writer_oid, seqnum, lead, bitcount),
-                verb)
+                "Received GAP from writer %s for [%d, %d] (+%d)",
+                verb, args=(writer_oid, seqnum, lead, bitcount))
 
 
 def on_send_ack(match, state, logger):
@@ -510,9 +521,8 @@ def on_send_ack(match, state, logger):
     verb = 1 if is_builtin_entity(remote[3]) else 0
     logger.send(writer_addr,
                 reader_oid,
-                "Sent ACK [%d] to writer %s for %d count %d" %
-                (epoch, writer_oid, lead, bitcount),
-                verb)
+                "Sent ACK [%d] to writer %s for %d count %d",
+                verb, args=(epoch, writer_oid, lead, bitcount))
 
 
 def on_send_nack(match, state, logger):
@@ -527,9 +537,8 @@ def on_send_nack(match, state, logger):
     verb = 1 if is_builtin_entity(remote[3]) else 0
     logger.send(writer_addr,
                 reader_oid,
-                "Sent NACK [%d] to writer %s for %d count %d" %
-                (epoch, writer_oid, lead, bitcount),
-                verb)
+                "Sent NACK [%d] to writer %s for %d count %d",
+                verb, args=(epoch, writer_oid, lead, bitcount))
 
 
 def on_send_nack_frag(match, state, logger):
@@ -538,8 +547,8 @@ def on_send_nack_frag(match, state, logger):
     seqnum = parse_sn(match[1])
     verb = 1 if is_builtin_entity(match[0]) else 0
     logger.send("", reader_oid,
-                "Sent NACK_FRAG for sample %d" % seqnum,
-                verb)
+                "Sent NACK_FRAG for sample %d",
+                verb, args=(seqnum,))
 
 
 def on_suppress_hb(match, state, logger):
@@ -559,7 +568,7 @@ def on_sample_received_from_deleted_writer(match, state, logger):
 def on_deserialize_failure(match, state, logger):
     """It happens when the reader is not able to deserialize a sample."""
     kind = "keyed" if match[0] == "CstReaderCollator" else "unkeyed"
-    logger.error("[LP-17] Cannot deserialize %s sample" % kind)
+    logger.error("[LP-17] Cannot deserialize %s sample", args=(kind,))
 
 
 def on_shmem_queue_full(match, state, logger):
@@ -569,7 +578,8 @@ def on_shmem_queue_full(match, state, logger):
     count_max = match[1]
     max_size = match[2]
     logger.cfg("SharedMemory limits for queue " +
-               "%s (%s) are: max_num=%s, max_size=%s"
-               % (port, port_name, count_max, max_size))
-    logger.error("[LP-19] Sample dropped because SharedMemory queue %s is full"
-                 % port)
+               "%s (%s) are: max_num=%s, max_size=%s",
+               args=(port, port_name, count_max, max_size))
+    logger.error(
+        "[LP-19] Sample dropped because SharedMemory queue %s is full",
+        args=(port,))
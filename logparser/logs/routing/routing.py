@@ -47,11 +47,11 @@ def on_route_creation_failure(match, state, logger):
 # --------------------------------------------------------------------------- #
 def on_typecode_inconsistency(match, state, logger):
     """It happens when RS detects two different types with same name."""
-    logger.error("RS found two different types with the same name: %s"
-                 % match[0])
+    logger.error("RS found two different types with the same name: %s",
+                 args=(match[0],))
 
 
 def on_typecode_not_found(match, state, logger):
     """It happens when RS doesn't have the type code for a topic."""
-    logger.error("Typecode for %s is unavailable. Route will not work"
-                 % match[0])
+    logger.error("Typecode for %s is unavailable. Route will not work",
+                 args=(match[0],))
@@ -0,0 +1,132 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Obfuscation of the sensitive information.
+
+The texts are hashed with a keyed BLAKE2b, using the salt as the key, and
+the digests are kept in a bounded LRU cache since the same topics, types,
+ports and addresses appear in most of the log lines. The mapping can be
+saved into a JSON file and loaded in the next run to warm up the cache and
+to reuse the salt.
+
+Classes:
+  + Obfuscator: Obfuscate texts with a salt, caching the digests.
+
+Constants:
+  + CACHE_SIZE: Default maximum number of cached digests.
+  + MAP_VERSION: Version of the format of the map file.
+"""
+from __future__ import absolute_import
+import hmac
+import json
+from collections import OrderedDict
+from hashlib import md5
+
+try:
+    from hashlib import blake2b
+except ImportError:  # Python 2.7
+    blake2b = None
+
+CACHE_SIZE = 4096
+MAP_VERSION = 1
+
+# The digest has the same length as the MD5 one used before.
+_DIGEST_SIZE = 16
+
+
+class Obfuscator(object):
+    """Obfuscate texts with a salt, caching the digests.
+
+    The cache is a least-recently-used mapping from the text to its digest
+    in hexadecimal. Without BLAKE2b (Python 2.7), the digest is a HMAC-MD5.
+
+    Functions:
+      + obfuscate: Get the digest of a text.
+      + update: Add digests to the cache.
+      + load: Load the salt and the mapping from a map file.
+      + save: Save the salt and the mapping into a map file.
+    """
+
+    def __init__(self, salt, size=CACHE_SIZE):
+        """Initialize the obfuscator with the salt and the cache size."""
+        self.salt = salt
+        self._size = size
+        self._cache = OrderedDict()
+        key = salt.encode('utf-8')
+        if blake2b is not None and len(key) > blake2b.MAX_KEY_SIZE:
+            key = blake2b(key).digest()
+        self._key = key
+
+    def __len__(self):
+        """Get the number of cached digests."""
+        return len(self._cache)
+
+    def obfuscate(self, text):
+        """Get the digest of a text.
+
+        Returns:
+            str: the digest in hexadecimal.
+        """
+        cache = self._cache
+        digest = cache.pop(text, None)
+        if digest is None:
+            digest = self._hash(text)
+            if len(cache) >= self._size:
+                cache.popitem(last=False)
+        cache[text] = digest
+        return digest
+
+    def _hash(self, text):
+        """Hash a text with the key."""
+        data = text.encode('utf-8')
+        if blake2b is None:
+            return hmac.new(self._key, data, md5).hexdigest()
+        return blake2b(data, digest_size=_DIGEST_SIZE,
+                       key=self._key).hexdigest()
+
+    def save(self, file_path):
+        """Save the salt and the mapping into a map file.
+
+        The file reveals the original texts, so it must not be shared.
+        """
+        content = {
+            'version': MAP_VERSION,
+            'salt': self.salt,
+            'names': list(self._cache.items())
+        }
+        with open(file_path, 'w') as map_file:
+            json.dump(content, map_file)
+
+    @staticmethod
+    def load(file_path):
+        """Load the salt and the mapping from a map file.
+
+        Returns:
+            A tuple with the salt and the list of (text, digest) pairs in
+            order of use, or None if the file has a different version.
+        """
+        with open(file_path) as map_file:
+            content = json.load(map_file)
+        if content.get('version') != MAP_VERSION:
+            return None
+        return content['salt'], [tuple(pair) for pair in content['names']]
+
+    def update(self, names):
+        """Add the (text, digest) pairs to the cache, in order of use."""
+        for text, digest in names[-self._size:]:
+            self._cache.pop(text, None)
+            self._cache[text] = digest
+        while len(self._cache) > self._size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,120 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Statistics of the packets.
+
+The packet kinds (e.g.: DATA, HEARTBEAT, ACKNACK, GAP) are interned to
+small integers in order of appearance, and the packets are counted in an
+array for each entity and direction that grows with the number of kinds.
+The order of appearance of the directions and kinds of each entity is
+kept for the summary.
+
+Classes:
+  + PacketStatistics: Counters of the packets of each entity and direction.
+
+Constants:
+  + DIRECTIONS: Directions of the packets.
+  + INITIAL_PACKET_KINDS: Initial number of counters of each entity and
+    direction.
+"""
+from __future__ import absolute_import
+from array import array
+
+try:
+    array('Q')
+    _TYPECODE = 'Q'
+except ValueError:  # Python 2.7
+    _TYPECODE = 'L'
+
+DIRECTIONS = ('receive', 'send')
+INITIAL_PACKET_KINDS = 8
+
+_DIRECTION_IDS = dict((name, i) for i, name in enumerate(DIRECTIONS))
+
+
+class PacketStatistics(object):
+    """Counters of the packets of each entity and direction.
+
+    Functions:
+      + add: Count a packet.
+      + get_kind_id: Get the integer of a packet kind, interning it.
+      + get_counters: Get the counters of each entity and direction.
+    """
+
+    __slots__ = ('kinds', '_kind_ids', '_entities')
+
+    def __init__(self):
+        """Constructor of the class."""
+        self.kinds = []
+        self._kind_ids = {}
+        self._entities = {}
+
+    def __bool__(self):
+        """Check if any packet was counted."""
+        return bool(self._entities)
+
+    __nonzero__ = __bool__  # Python 2.7
+
+    def add(self, guid, direction, kind):
+        """Count a packet of the entity in the direction."""
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self.get_kind_id(kind)
+        # Each entity has the counters and the order of the kinds for each
+        # direction, and the order of the directions.
+        entity = self._entities.get(guid)
+        if entity is None:
+            entity = self._entities[guid] = \
+                ([None] * len(DIRECTIONS), [None] * len(DIRECTIONS), [])
+        direction_id = _DIRECTION_IDS[direction]
+        counters = entity[0][direction_id]
+        if counters is None:
+            counters = entity[0][direction_id] = \
+                array(_TYPECODE, [0]) * INITIAL_PACKET_KINDS
+            entity[1][direction_id] = array('I')
+            entity[2].append(direction_id)
+        if kind_id >= len(counters):
+            counters.extend(array(_TYPECODE, [0]) *
+                            max(kind_id + 1 - len(counters), len(counters)))
+        if not counters[kind_id]:
+            entity[1][direction_id].append(kind_id)
+        counters[kind_id] += 1
+
+    def get_kind_id(self, kind):
+        """Get the integer of a packet kind, interning it."""
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self._kind_ids[kind] = len(self.kinds)
+            self.kinds.append(kind)
+        return kind_id
+
+    def get_counters(self):
+        """Get the counters of each entity and direction.
+
+        Returns:
+            A list of (guid, direction, total, kinds) tuples in order of
+            appearance, where kinds is a list of (kind, count) tuples in
+            order of appearance for the entity and direction.
+        """
+        names = self.kinds
+        result = []
+        for guid, (counters, orders, directions) in self._entities.items():
+            for direction_id in directions:
+                counts = counters[direction_id]
+                kinds = [(names[kind_id], counts[kind_id])
+                         for kind_id in orders[direction_id]]
+                result.append((guid, DIRECTIONS[direction_id], sum(counts),
+                               kinds))
+        return result
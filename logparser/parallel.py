@@ -0,0 +1,164 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Match the log lines of a file in parallel.
+
+The regular expression matching doesn't depend on the parser state, so it
+can run in a pool of processes. The log handlers must run in order in the
+main process since they update the state.
+
+Functions:
+  + split_file: Split a file into ranges of complete lines.
+  + match_ranges: Match the ranges of a file in a pool of processes.
+  + init_worker: Initialize the process to match lines.
+  + match_range: Match the lines in a range of a file.
+
+Constants:
+  + CHUNK_SIZE: Approximated size of each range of the file.
+"""
+from __future__ import absolute_import
+from collections import deque
+from multiprocessing import Pool
+from signal import SIGINT, SIG_IGN, signal
+from sys import exc_info
+from traceback import extract_tb
+
+from logparser.clockdecoder import ClockDecoder
+from logparser.logs.logs import (create_regex_index, create_regex_list,
+                                 get_line_expressions)
+
+CHUNK_SIZE = 4 << 20
+
+# Matching information of the worker process
+_WORKER = {}
+
+
+def split_file(file_path, chunk_size=CHUNK_SIZE):
+    """Split a file into ranges of complete lines.
+
+    Returns:
+        A generator of tuples with the start and end offset of each range.
+    """
+    with open(file_path, "rb") as stream:
+        start = 0
+        while True:
+            stream.seek(start + chunk_size)
+            stream.readline()
+            end = stream.tell()
+            if end <= start + chunk_size:
+                # We have reached the end of the file.
+                end = stream.seek(0, 2) or stream.tell()
+                if end > start:
+                    yield (start, end)
+                return
+            yield (start, end)
+            start = end
+
+
+def match_ranges(file_path, jobs, state):
+    """Match the ranges of a file in a pool of processes.
+
+    The results are returned in the same order as the file ranges. There are
+    at most two ranges per process being matched or waiting to be consumed,
+    so the memory doesn't grow if the handlers are slower than the matching.
+
+    Returns:
+        A generator of tuples with the end offset of the range and the
+        result of match_range.
+    """
+    pool = Pool(jobs, init_worker, (state.debug, state.write_original))
+    try:
+        pending = deque()
+        for start, end in split_file(file_path):
+            pending.append((end, pool.apply_async(
+                match_range, (file_path, start, end))))
+            if len(pending) >= 2 * jobs:
+                end, result = pending.popleft()
+                yield end, result.get()
+        while pending:
+            end, result = pending.popleft()
+            yield end, result.get()
+    finally:
+        pool.terminate()
+
+
+def init_worker(debug, write_original):
+    """Initialize the process to match lines."""
+    # The main process handles the SIGINT.
+    signal(SIGINT, SIG_IGN)
+    _WORKER['expressions'] = create_regex_list({'debug': debug})
+    _WORKER['index'] = create_regex_index(_WORKER['expressions'])
+    _WORKER['cache'] = {}
+    _WORKER['decoder'] = ClockDecoder()
+    _WORKER['write_original'] = write_original
+
+
+def match_range(file_path, start, end):
+    """Match the lines in a range of a file.
+
+    Returns:
+        A tuple with the number of lines in the range and the list of
+        records. There is a record for each line with clocks or a match
+        (or for any non-empty line if the original log is written). The
+        record is a tuple with:
+          + the line number from the start of the range.
+          + the line if the original log is written, None otherwise.
+          + the clocks or None.
+          + the position of the matched expression or None.
+          + the groups of the match or None.
+          + the description of the script error or None.
+    """
+    with open(file_path, "rb") as stream:
+        stream.seek(start)
+        data = stream.read(end - start)
+    lines = data.decode("utf-8", "replace").split("\n")
+    if data.endswith(b"\n"):
+        lines.pop()
+
+    expressions = _WORKER['expressions']
+    index = _WORKER['index']
+    cache = _WORKER['cache']
+    decoder = _WORKER['decoder']
+    write_original = _WORKER['write_original']
+    records = []
+    for number, line in enumerate(lines, 1):
+        # Same pre-processing as LogParser._parse_line
+        line = line.rstrip("\r\n")
+        if "\x00" in line:
+            line = line.replace("\x00", " ")
+        if not line:
+            continue
+
+        original = line if write_original else None
+        try:
+            clocks = decoder.decode(line)
+        except Exception as ex:  # pylint: disable=W0703
+            stacktraces = extract_tb(exc_info()[2])
+            error = "%s %s" % (str(stacktraces[-1]), ex)
+            records.append((number, original, None, None, None, error))
+            continue
+
+        position = None
+        groups = None
+        for expr in get_line_expressions(line, expressions, index, cache):
+            match = expr[1].search(line)
+            if match:
+                position = expr[3]
+                groups = match.groups()
+                break
+
+        if clocks or position is not None or write_original:
+            records.append((number, original, clocks, position, groups, None))
+    return len(lines), records
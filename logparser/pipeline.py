@@ -0,0 +1,217 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Pipeline to read, parse and write the logs in different threads.
+
+The input device is read from a reader thread and the messages are
+formatted and written from a writer thread. The matching and the handlers
+run in the main thread since they update the parser state. The stages are
+connected with bounded queues of batches, so a slow stage blocks the
+previous one.
+
+Classes:
+  + Pipeline: Run the reader and writer stages in threads.
+  + PipelineFormatDevice: Format device that writes from the writer thread.
+  + PipelineOutputDevice: Output device that writes from the writer thread.
+"""
+from __future__ import absolute_import
+from threading import Thread
+from time import time
+
+from logparser.devices.formatdevice import FormatDevice
+from logparser.devices.outputdevices import OutputDevice
+
+try:
+    from queue import Queue  # Python 3.x
+except ImportError:
+    from Queue import Queue  # Python 2.7
+
+
+class Pipeline(object):
+    """Run the reader and writer stages in threads.
+
+    Functions:
+      + start: start the reader and writer threads.
+      + read_lines: get the next batch of lines from the reader thread.
+      + put: call a function from the writer thread.
+      + flush: send the pending calls to the writer thread.
+      + close: wait until the writer thread finishes.
+      + get_info: get the queue depths and the busy time of each stage.
+    """
+
+    def __init__(self, device, queue_size=8, batch_size=512):
+        """Initialize the pipeline for the given input device."""
+        self.device = device
+        self.batch_size = batch_size
+        # The progress is printed from the main thread with the position of
+        # the batch being parsed.
+        self.show_progress = device.show_progress
+        device.show_progress = False
+        self.busy = {'read': 0.0, 'parse': 0.0, 'write': 0.0}
+        self._input_queue = Queue(queue_size)
+        self._output_queue = Queue(queue_size)
+        self._output = []
+        self._parse_start = None
+        self._eof = False
+        self._error = None
+        self._reader = Thread(target=self._read, name="LogParserReader")
+        self._reader.daemon = True
+        self._writer = Thread(target=self._write, name="LogParserWriter")
+        self._writer.daemon = True
+
+    def start(self):
+        """Start the reader and writer threads."""
+        self._reader.start()
+        self._writer.start()
+
+    def _read(self):
+        """Read batches of lines from the input device."""
+        while True:
+            start = time()
+            try:
+                lines = self.device.read_lines()
+            except Exception as ex:  # pylint: disable=W0703
+                lines = ex
+            self.busy['read'] += time() - start
+            self._input_queue.put((lines, self.device.get_position()))
+            if not isinstance(lines, list):
+                return
+
+    def _write(self):
+        """Call the functions from the main thread."""
+        while True:
+            batch = self._output_queue.get()
+            if batch is None:
+                return
+            # Keep consuming on error so the main thread is never blocked.
+            if self._error is not None:
+                continue
+            start = time()
+            try:
+                for function, args in batch:
+                    function(*args)
+            except Exception as ex:  # pylint: disable=W0703
+                self._error = ex
+            self.busy['write'] += time() - start
+
+    def read_lines(self):
+        """Get the next batch of lines from the reader thread.
+
+        Before waiting for the next batch, the pending calls of the current
+        batch are sent to the writer thread. Return None on EOF.
+        """
+        if self._parse_start is not None:
+            self.busy['parse'] += time() - self._parse_start
+        self.flush()
+        if self._eof:
+            return None
+
+        lines, position = self._input_queue.get()
+        if self.show_progress:
+            self.device.progress_info = self.get_info()
+            self.device.print_status(position)
+        if isinstance(lines, Exception):
+            self._eof = True
+            raise lines
+        self._eof = lines is None
+        self._parse_start = time()
+        return lines
+
+    def put(self, function, *args):
+        """Call a function from the writer thread."""
+        self._output.append((function, args))
+        if len(self._output) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Send the pending calls to the writer thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if self._output:
+            self._output_queue.put(self._output)
+            self._output = []
+
+    def close(self):
+        """Wait until the writer thread finishes."""
+        self.flush()
+        if self._writer.is_alive():
+            self._output_queue.put(None)
+            self._writer.join()
+        if self._error is not None:
+            raise self._error
+
+    def get_info(self):
+        """Get the queue depths and the busy time of each stage."""
+        return " | Queues: %d in, %d out | Busy: %.1fs read, %.1fs parse, " \
+            "%.1fs write" % (self._input_queue.qsize(),
+                             self._output_queue.qsize(), self.busy['read'],
+                             self.busy['parse'], self.busy['write'])
+
+
+class PipelineFormatDevice(FormatDevice):
+    """Format device that writes the messages from the writer thread.
+
+    The messages are formatted and written asynchronously, so the output
+    line of the message is set just before writing it. The rest of methods
+    are called directly since they are not called while parsing.
+    """
+
+    def __init__(self, format_device, pipeline):
+        """Initialize the device."""
+        self.format_device = format_device
+        self.pipeline = pipeline
+
+    def write_header(self, state):
+        """Write the header if any."""
+        self.format_device.write_header(state)
+
+    def write_message(self, message, state):
+        """Write the message from the writer thread."""
+        self.pipeline.put(self._write_message, message, state)
+
+    def _write_message(self, message, state):
+        """Set the output line and write the message."""
+        message.output_line = state.output_line + 1
+        self.format_device.write_message(message, state)
+
+    def write_configurations(self, state):
+        """Write the configuration messages."""
+        self.format_device.write_configurations(state)
+
+    def write_warnings(self, state):
+        """Write the warning messages."""
+        self.format_device.write_warnings(state)
+
+    def write_errors(self, state):
+        """Write the error messages."""
+        self.format_device.write_errors(state)
+
+
+class PipelineOutputDevice(OutputDevice):
+    """Output device that writes from the writer thread."""
+
+    def __init__(self, output_device, pipeline):
+        """Initialize the device."""
+        self.output_device = output_device
+        self.pipeline = pipeline
+
+    def write(self, text=""):
+        """Write the log from the writer thread."""
+        self.pipeline.put(self.output_device.write, text)
+
+    def close(self):
+        """Close the device."""
+        self.output_device.close()
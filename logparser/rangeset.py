@@ -0,0 +1,133 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Set of integers stored as ranges.
+
+The module contains the RangeSet class.
+"""
+from bisect import bisect_left, bisect_right
+
+
+class RangeSet(object):
+    """Set of integers stored as sorted and disjoint ranges.
+
+    The ranges are half-open intervals [start, end). The starts and the ends
+    are kept in two sorted lists, so the ranges are found with a binary
+    search. Consecutive integers (e.g.: sequence numbers) take one range.
+    The integers below the floor are unknown after dropping the first
+    ranges.
+    """
+
+    __slots__ = ('_starts', '_ends', 'floor')
+
+    def __init__(self):
+        """Constructor of the class."""
+        self._starts = []
+        self._ends = []
+        self.floor = None
+
+    def __contains__(self, value):
+        """Check if the integer is in the set."""
+        position = bisect_right(self._starts, value) - 1
+        return position >= 0 and value < self._ends[position]
+
+    def __bool__(self):
+        """Check if the set is not empty."""
+        return bool(self._starts)
+
+    __nonzero__ = __bool__  # Python 2.7
+
+    def last(self):
+        """Get the largest integer of the set.
+
+        Returns:
+            int: the largest integer, or None if the set is empty.
+        """
+        return self._ends[-1] - 1 if self._ends else None
+
+    def ranges(self):
+        """Get the ranges of the set.
+
+        Returns:
+            A list of (start, end) tuples in order.
+        """
+        return list(zip(self._starts, self._ends))
+
+    def add(self, value):
+        """Add an integer to the set."""
+        self.add_range(value, value + 1)
+
+    def add_range(self, start, end):
+        """Add the integers in [start, end) to the set.
+
+        The range is merged with the ranges that overlap or touch it.
+        """
+        if start >= end:
+            return
+        low = bisect_left(self._ends, start)
+        high = bisect_right(self._starts, end)
+        if low < high:
+            start = min(start, self._starts[low])
+            end = max(end, self._ends[high - 1])
+        self._starts[low:high] = [start]
+        self._ends[low:high] = [end]
+
+    def discard(self, value):
+        """Remove an integer from the set if present.
+
+        Returns:
+            bool: True if the integer was in the set.
+        """
+        return bool(self.remove_range(value, value + 1))
+
+    def remove_range(self, start, end):
+        """Remove the integers in [start, end) from the set.
+
+        Returns:
+            A list of (start, end) tuples with the removed ranges.
+        """
+        if start >= end:
+            return []
+        low = bisect_right(self._ends, start)
+        high = bisect_left(self._starts, end)
+        if low >= high:
+            return []
+
+        removed = [(max(first, start), min(last, end)) for first, last in
+                   zip(self._starts[low:high], self._ends[low:high])]
+        # Keep the parts of the first and last ranges outside the interval.
+        starts = []
+        ends = []
+        if self._starts[low] < start:
+            starts.append(self._starts[low])
+            ends.append(start)
+        if self._ends[high - 1] > end:
+            starts.append(end)
+            ends.append(self._ends[high - 1])
+        self._starts[low:high] = starts
+        self._ends[low:high] = ends
+        return removed
+
+    def drop_first(self, max_ranges):
+        """Drop the first ranges so there are at most max_ranges.
+
+        The floor is moved to the end of the last dropped range, so the set
+        doesn't know if the integers below it were added.
+        """
+        excess = len(self._starts) - max_ranges
+        if excess > 0:
+            self.floor = self._ends[excess - 1]
+            del self._starts[:excess]
+            del self._ends[:excess]
@@ -0,0 +1,210 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Time series of the bandwidth.
+
+The bytes and packets are counted per interval of the clock (one second by
+default), so the summary can show the peak rates and the bursts and not
+only the average rate.
+
+Classes:
+  + RateSeries: Counters of bytes and packets per interval.
+
+Functions:
+  + get_rate_parameters: Convert the rate options into series parameters.
+
+Constants:
+  + MIN_INTERVAL: Minimum interval in seconds, the resolution of the clocks.
+  + INITIAL_BUCKETS: Initial number of intervals of the ring buffers.
+  + BURST_FACTOR: Times the average rate to consider an interval a burst.
+  + MAX_BURSTS: Maximum number of bursts in the summary.
+"""
+from __future__ import absolute_import
+from array import array
+
+try:
+    array('Q')
+    _TYPECODE = 'Q'
+except ValueError:  # Python 2.7
+    _TYPECODE = 'L'
+
+MIN_INTERVAL = 0.000001
+INITIAL_BUCKETS = 64
+BURST_FACTOR = 2
+MAX_BURSTS = 3
+
+
+def get_rate_parameters(interval, window):
+    """Convert the rate options into series parameters.
+
+    Args:
+        interval (float): seconds of each interval.
+        window (float): seconds of the intervals to keep.
+
+    Returns:
+        A tuple with the interval in microseconds and the maximum number of
+        intervals.
+
+    Raises:
+        ValueError: the interval is shorter than MIN_INTERVAL or longer
+            than the window.
+    """
+    if interval < MIN_INTERVAL or window < interval:
+        raise ValueError("The rate interval must be at least one " +
+                         "microsecond and not greater than the window")
+    interval = int(round(interval * 1000000))
+    return interval, int(round(window * 1000000)) // interval
+
+
+def _new_counters(size):
+    """Create an array of counters set to zero."""
+    return array(_TYPECODE, [0]) * size
+
+
+class RateSeries(object):
+    """Counters of bytes and packets per interval.
+
+    The counters are kept in two ring buffers indexed by the clock divided
+    by the interval. The buffers grow up to max_buckets intervals, then the
+    oldest intervals are overwritten, so the memory is bounded by the
+    retained duration. The samples older than that duration are dropped.
+
+    Functions:
+      + add: Count a packet.
+      + get_buckets: Get the counters of each retained interval.
+      + get_summary: Get the peak, median and 99th percentile rates.
+      + get_bursts: Get the intervals with rates over the average.
+    """
+
+    __slots__ = ('interval', 'max_buckets', 'first', 'last', '_bytes',
+                 '_packets')
+
+    def __init__(self, interval, max_buckets):
+        """Initialize the series with the interval in microseconds."""
+        self.interval = interval
+        self.max_buckets = max_buckets
+        self.first = None
+        self.last = None
+        self._bytes = _new_counters(min(max_buckets, INITIAL_BUCKETS))
+        self._packets = _new_counters(len(self._bytes))
+
+    def add(self, clock, qty):
+        """Count a packet with the clock in microseconds."""
+        bucket = clock // self.interval
+        if self.last is None:
+            self.first = self.last = bucket
+        elif bucket > self.last:
+            self._advance(bucket)
+        elif bucket < self.first:
+            if bucket <= self.last - self.max_buckets:
+                return
+            self._resize(self.last - bucket + 1)
+            self.first = bucket
+        slot = bucket % len(self._bytes)
+        self._bytes[slot] += qty
+        self._packets[slot] += 1
+
+    def _advance(self, bucket):
+        """Move the last interval forward, clearing the reused slots."""
+        self._resize(bucket - self.first + 1)
+        size = len(self._bytes)
+        for position in range(max(self.last + 1, bucket - size + 1),
+                              bucket + 1):
+            self._bytes[position % size] = 0
+            self._packets[position % size] = 0
+        self.first = max(self.first, bucket - size + 1)
+        self.last = bucket
+
+    def _resize(self, span):
+        """Grow the ring buffers to fit the span of intervals if possible."""
+        size = len(self._bytes)
+        if span <= size or size == self.max_buckets:
+            return
+        new_size = min(self.max_buckets, max(span, size * 2))
+        new_bytes = _new_counters(new_size)
+        new_packets = _new_counters(new_size)
+        for position in range(self.first, self.last + 1):
+            new_bytes[position % new_size] = self._bytes[position % size]
+            new_packets[position % new_size] = self._packets[position % size]
+        self._bytes = new_bytes
+        self._packets = new_packets
+
+    def get_buckets(self):
+        """Get the counters of each retained interval.
+
+        Returns:
+            A list of (clock, bytes, packets) tuples in order, with the
+            clock of the start of the interval.
+        """
+        if self.last is None:
+            return []
+        size = len(self._bytes)
+        return [(position * self.interval, self._bytes[position % size],
+                 self._packets[position % size])
+                for position in range(self.first, self.last + 1)]
+
+    def get_summary(self):
+        """Get the peak, median and 99th percentile rates.
+
+        Returns:
+            A dictionary with the 'bytes' and 'packets' rates per second,
+            each one a dictionary with 'peak', 'p50' and 'p99'.
+        """
+        buckets = self.get_buckets()
+        scale = 1000000.0 / self.interval
+        summary = {}
+        for name, column in (('bytes', 1), ('packets', 2)):
+            values = sorted(bucket[column] for bucket in buckets) or [0]
+            summary[name] = {
+                'peak': values[-1] * scale,
+                'p50': _get_percentile(values, 50) * scale,
+                'p99': _get_percentile(values, 99) * scale
+            }
+        return summary
+
+    def get_bursts(self):
+        """Get the intervals with rates over the average.
+
+        A burst is a run of consecutive intervals with more than
+        BURST_FACTOR times the average bytes per interval.
+
+        Returns:
+            A list with the MAX_BURSTS largest bursts in order of time, as
+            (start clock, end clock, bytes, packets) tuples.
+        """
+        buckets = self.get_buckets()
+        if len(buckets) < 2:
+            return []
+        threshold = BURST_FACTOR * sum(b[1] for b in buckets) / len(buckets)
+        bursts = []
+        current = None
+        for clock, qty, packets in buckets:
+            if qty <= threshold:
+                current = None
+            elif current is None:
+                current = [clock, clock + self.interval, qty, packets]
+                bursts.append(current)
+            else:
+                current[1] += self.interval
+                current[2] += qty
+                current[3] += packets
+        bursts.sort(key=lambda burst: burst[2], reverse=True)
+        return sorted(tuple(burst) for burst in bursts[:MAX_BURSTS])
+
+
+def _get_percentile(values, percent):
+    """Get the percentile of the sorted values by the nearest rank."""
+    rank = -(-len(values) * percent // 100)
+    return values[max(rank, 1) - 1]
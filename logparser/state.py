@@ -0,0 +1,131 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""State of the parser.
+
+The state has the options of the parser, the devices and the information
+collected while parsing. The containers are created up front, so the
+handlers don't need to check if they exist before using them.
+
+Classes:
+  + ParserState: State of the parser.
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+
+from logparser.countset import CountSet
+from logparser.packetstats import PacketStatistics
+
+
+class ParserState(object):
+    """State of the parser.
+
+    The fields are attributes (e.g.: state.statistics). For backward
+    compatibility, the state can be used as a mapping too (e.g.:
+    state['statistics']), and the keys that are not fields (e.g.: from
+    custom parsers) are kept in an internal dictionary. A field is in the
+    mapping if its value is not None. Setting a field that changes the
+    names of the GUIDs (e.g.: state['participants']) clears their cache.
+
+    Attributes:
+        OPTIONS: fields of the options, devices and counters. They are set
+            by the parser and they are None until then.
+        CONTAINERS: fields of the information collected while parsing, with
+            the function to create them.
+    """
+
+    OPTIONS = (
+        'no_timestamp', 'obfuscate', 'salt', 'obfuscator', 'assign_names',
+        'no_stats', 'rate_interval', 'rate_buckets', 'show_progress',
+        'show_lines', 'write_original', 'output_line', 'input_line', 'debug',
+        'verbosity', 'jobs', 'clock_decoder', 'clocks', 'input_file',
+        'input_device', 'output_device', 'format_device')
+    CONTAINERS = (
+        ('warnings', CountSet), ('errors', CountSet), ('config', CountSet),
+        ('statistics', dict), ('statistics_rate', dict),
+        ('statistics_packet', PacketStatistics), ('periodic_event', dict),
+        ('threads', dict), ('names', dict), ('name_table', dict),
+        ('participants', dict), ('locators', dict),
+        ('local_address', set), ('initial_peers', list),
+        ('packets_lost', dict), ('received_sn', OrderedDict),
+        ('guid_names', dict))
+
+    __slots__ = OPTIONS + tuple(name for name, _ in CONTAINERS) + ('_extra',)
+
+    def __init__(self):
+        """Initialize the options and create the containers."""
+        for name in self.OPTIONS:
+            setattr(self, name, None)
+        for name, factory in self.CONTAINERS:
+            setattr(self, name, factory())
+        self._extra = {}
+
+    def __getitem__(self, key):
+        """Get a field or a custom key."""
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        """Set a field or a custom key."""
+        if key in _FIELDS:
+            setattr(self, key, value)
+            if key in _NAME_FIELDS:
+                self.guid_names.clear()
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        """Unset a field or remove a custom key."""
+        if key in _FIELDS:
+            setattr(self, key, None)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        """Check if a field is set or a custom key exists."""
+        if key in _FIELDS:
+            return getattr(self, key) is not None
+        return key in self._extra
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(self.keys())
+
+    def get(self, key, default=None):
+        """Get a field or a custom key, or the default value if missing."""
+        return self[key] if key in self else default
+
+    def keys(self):
+        """Get the keys of the set fields and the custom keys."""
+        return [name for name in _FIELD_NAMES
+                if getattr(self, name) is not None] + list(self._extra)
+
+    def items(self):
+        """Get the pairs of key and value of the mapping."""
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, values):
+        """Update the fields and custom keys from a mapping."""
+        for key, value in values.items():
+            self[key] = value
+
+
+_FIELD_NAMES = ParserState.__slots__[:-1]
+_FIELDS = frozenset(_FIELD_NAMES)
+# Fields used to get the names of the GUIDs.
+_NAME_FIELDS = frozenset([
+    'participants', 'local_address', 'initial_peers', 'assign_names',
+    'obfuscate', 'obfuscator'])
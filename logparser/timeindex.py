@@ -0,0 +1,196 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Sparse timestamp index of a log file.
+
+The index has an entry for the first log with clocks after every interval
+of the file. Each entry has the offset and the line number where the log
+starts, and its system clock. The index is stored in a text file next to
+the log, and it's extended when the log grows.
+
+Functions:
+  + get_index: Load the index of a log file, building it if needed.
+  + build_index: Add the entries of a range of the log file to an index.
+  + find_entry: Get the last entry of the index before a system clock.
+  + warm_up: Run the discovery logs of a range of the log file.
+
+Constants:
+  + INDEX_VERSION: Version of the index format.
+  + INDEX_INTERVAL: Number of bytes of the log file between entries.
+  + INDEX_SUFFIX: Suffix of the index file path.
+"""
+from __future__ import absolute_import
+import re
+from bisect import bisect_right
+from os.path import getsize
+
+from logparser.checkpoint import get_fingerprint
+from logparser.clockdecoder import CLOCKS_BYTES_REGEX, ClockDecoder
+
+INDEX_VERSION = 1
+INDEX_INTERVAL = 256 << 10
+INDEX_SUFFIX = ".idx"
+
+
+def get_index(file_path):
+    """Load the index of a log file, building it if needed.
+
+    The index file is updated if the log has grown. If it cannot be
+    written, the index is only kept in memory.
+
+    Returns:
+        A list of tuples with the offset, the number of previous lines and
+        the system clock of each entry.
+    """
+    index_path = file_path + INDEX_SUFFIX
+    index = _load_index(index_path)
+    if index is not None:
+        end, lines, fingerprint, entries = index
+        if end > getsize(file_path) or \
+                get_fingerprint(file_path, end) != fingerprint:
+            index = None
+    if index is None:
+        end, lines, entries = 0, 0, []
+
+    new_end, lines = build_index(file_path, entries, end, lines)
+    if new_end != end or index is None:
+        try:
+            _save_index(index_path, entries, new_end, lines,
+                        get_fingerprint(file_path, new_end))
+        except (IOError, OSError):
+            pass
+    return entries
+
+
+def _load_index(index_path):
+    """Load an index file.
+
+    Returns:
+        A tuple with the offset and the number of lines indexed, the
+        fingerprint of the log and the entries, or None if the file doesn't
+        exist or it isn't valid.
+    """
+    try:
+        with open(index_path, "r") as stream:
+            header = stream.readline().split()
+            if len(header) != 5 or header[0] != str(INDEX_VERSION) or \
+                    header[1] != str(INDEX_INTERVAL):
+                return None
+            entries = [tuple(int(value) for value in entry.split())
+                       for entry in stream]
+        return (int(header[2]), int(header[3]), header[4], entries)
+    except (IOError, ValueError):
+        return None
+
+
+def _save_index(index_path, entries, end, lines, fingerprint):
+    """Save an index file."""
+    with open(index_path, "w") as stream:
+        stream.write("%d %d %d %d %s\n" % (INDEX_VERSION, INDEX_INTERVAL,
+                                           end, lines, fingerprint))
+        stream.writelines("%d %d %d\n" % entry for entry in entries)
+
+
+def build_index(file_path, entries, offset=0, lines=0):
+    """Add the entries of a range of the log file to an index.
+
+    The range starts at the given offset, which must be the start of a line,
+    and finishes at the end of the last complete line of the file.
+
+    Returns:
+        A tuple with the offset and the number of lines at the end of the
+        range.
+    """
+    decoder = ClockDecoder()
+    with open(file_path, "rb") as stream:
+        stream.seek(offset)
+        while True:
+            chunk = stream.read(INDEX_INTERVAL)
+            chunk += stream.readline()
+            eof = not chunk.endswith(b"\n")
+            if eof:
+                # Don't index the last line until it's complete.
+                chunk = chunk[:chunk.rfind(b"\n") + 1]
+
+            clocks = CLOCKS_BYTES_REGEX.search(chunk)
+            if clocks:
+                start = chunk.rfind(b"\n", 0, clocks.start()) + 1
+                line = chunk[start:clocks.end()].decode("utf-8", "replace")
+                entries.append((offset + start,
+                                lines + chunk.count(b"\n", 0, start),
+                                decoder.decode(line)[1]))
+            offset += len(chunk)
+            lines += chunk.count(b"\n")
+            if eof:
+                return (offset, lines)
+
+
+def find_entry(entries, system):
+    """Get the last entry of the index before a system clock.
+
+    Returns:
+        A tuple with the offset and the number of previous lines of the
+        entry, or (0, 0) if there isn't any entry before.
+    """
+    position = bisect_right([entry[2] for entry in entries], system) - 1
+    if position < 0:
+        return (0, 0)
+    return entries[position][:2]
+
+
+def warm_up(file_path, end, expressions, state, logger):
+    """Run the discovery logs of a range of the log file.
+
+    The range starts at the beginning of the file. Only the lines that may
+    match the expressions are decoded, so the state of names, participants
+    and initial peers can be created without parsing the full range.
+    """
+    keys = [re.escape(expr[2].encode("ascii")) + b":"
+            for expr in expressions if expr[2] is not None]
+    keys += [expr[1].pattern.encode("utf-8")
+             for expr in expressions if expr[2] is None]
+    candidate_regex = re.compile(b"|".join(keys))
+
+    with open(file_path, "rb") as stream:
+        offset = 0
+        while offset < end:
+            chunk = stream.read(min(INDEX_INTERVAL, end - offset))
+            if offset + len(chunk) < end:
+                chunk += stream.readline()
+            offset += len(chunk)
+
+            position = 0
+            for candidate in candidate_regex.finditer(chunk):
+                if candidate.start() < position:
+                    continue
+                start = chunk.rfind(b"\n", 0, candidate.start()) + 1
+                position = chunk.find(b"\n", candidate.end())
+                if position == -1:
+                    position = len(chunk)
+                line = chunk[start:position].decode("utf-8", "replace")
+                try:
+                    _match_line(line, expressions, state, logger)
+                except Exception:  # pylint: disable=W0703
+                    # The logs of the warm up are not shown.
+                    pass
+
+
+def _match_line(line, expressions, state, logger):
+    """Call the function of the first expression that matches the line."""
+    for expr in expressions:
+        match = expr[1].search(line)
+        if match:
+            expr[0](match.groups(), state, logger)
+            return
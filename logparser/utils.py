@@ -22,6 +22,7 @@ Functions:
   + compare_times: Compare if the time clock times are equal.
   + add_statistics_packets: Add the given packet to the packet statistics.
   + add_statistics_bandwidth: Add the given packet to the bandwidth statistics.
+  + add_statistics_rate: Add the given packet to the bandwidth time series.
   + obfuscate: Obfuscate the given text.
   + get_oid: Get a name for the entity ID in hexadecimal text format.
   + is_builtin_entity: Return if the OID hex number is for a built-in entity.
@@ -35,8 +36,9 @@ Functions:
   + get_assign_name: Get the assigned name for the entity.
   + set_participant: Set the name of a participant.
   + set_local_address: Set the local address.
+  + set_initial_peers: Set the initial peers.
   + hex2ip: Convert the hexadecimal host ID into an IP address.
-  + parse_guid: Parse the entity GUID field and conver to text.
+  + parse_guid: Parse the entity GUID field and conver to text, with cache.
   + parse_sn: Parse the sequence number and return as a number.
 
 Constants:
@@ -45,9 +47,8 @@ Constants:
 """
 from __future__ import absolute_import
 
-from calendar import timegm
-from datetime import timedelta
-from hashlib import md5
+from logparser.rateseries import RateSeries
+
 
 INSTANCE_STATES = ["invalid", "alive", "disposed", "", "no_writers"]
 VIEW_STATES = ["invalid", "new", "not_new"]
@@ -56,40 +57,36 @@ VIEW_STATES = ["invalid", "new", "not_new"]
 def check_periodic(state, name, logger, msg=""):
     """Check if the given event is periodic."""
     # If there is no clock (timestamped log), returns always true
-    if 'clocks' not in state:
+    if state.clocks is None:
         return True
 
-    # Init
-    if 'periodic_event' not in state:
-        state['periodic_event'] = {}
-
     # Get the monotonic clock if possible, otherwise use the system clock.
-    has_monotonic = state['clocks'][0] is not None
-    clock = state['clocks'][0] if has_monotonic else state['clocks'][1]
+    clock = state.clocks[0]
+    if clock is None:
+        clock = state.clocks[1]
 
     # In the first call we don't have enought information
-    if name not in state['periodic_event']:
-        state['periodic_event'][name] = [-1, clock]
+    if name not in state.periodic_event:
+        state.periodic_event[name] = [-1, clock]
         return True
 
     # Get current period and previous one.
-    previous_period = state['periodic_event'][name][0]
-    period = clock - state['periodic_event'][name][1]
+    previous_period = state.periodic_event[name][0]
+    period = clock - state.periodic_event[name][1]
 
     # Update
-    state['periodic_event'][name][1] = clock
-    state['periodic_event'][name][0] = period
+    state.periodic_event[name][1] = clock
+    state.periodic_event[name][0] = period
 
     # If no previous period, returns true
     if previous_period == -1:
         return True
 
-    # Compare times.
-    tolerance = 0.1 if has_monotonic else timedelta(milliseconds=100)
-    result = compare_times(previous_period, period, tolerance)
+    # Compare times with a tolerance of 100 ms.
+    result = compare_times(previous_period, period, 100000)
     if result:
-        logger.warning("%s not periodic (%s by %s) %s" %
-                       (name, result[0], result[1], msg))
+        logger.warning("%s not periodic (%s by %.3f) %s" %
+                       (name, result[0], result[1] / 1000000.0, msg))
 
 
 def compare_times(past, future, tolerance):
@@ -106,39 +103,25 @@ def compare_times(past, future, tolerance):
 
 def add_statistics_packet(guid, typ, packet, state):
     """Add the given packet to the packet statistics."""
-    if 'statistics_packet' not in state:
-        state['statistics_packet'] = {}
-    stats = state['statistics_packet']
-    guid = guid.strip()
-
-    # Add to the guid counter
-    if guid not in stats:
-        stats[guid] = {}
-    if typ not in stats[guid]:
-        stats[guid][typ] = {'ALL': 0}
-    stats[guid][typ]['ALL'] += 1
-
-    # Add the specific packet counter
-    if packet not in stats[guid][typ]:
-        stats[guid][typ][packet] = 0
-    stats[guid][typ][packet] += 1
+    state.statistics_packet.add(guid.strip(), typ, packet)
 
 
 def add_statistics_bandwidth(addr, typ, qty, state):
     """Add the given packet to the bandwidth statistics."""
-    if 'statistics' not in state:
-        state['statistics'] = {}
-    stats = state['statistics']
+    stats = state.statistics
 
     addr = addr.split(":")
     port = addr[1] if len(addr) > 1 else 0
     addr = addr[0]
 
     # Get the monotonic clock if possible, otherwise use the system clock.
-    if 'clocks' in state:
-        clock = state['clocks'][0]
+    # The time series uses the same clock, so the bursts are relative to
+    # the first packet.
+    if state.clocks is not None:
+        clock = state.clocks[0]
         if clock is None:
-            clock = timegm(state['clocks'][1].timetuple())
+            clock = state.clocks[1]
+        add_statistics_rate(addr, port, typ, clock, qty, state)
     else:
         clock = 0
 
@@ -159,9 +142,22 @@ def add_statistics_bandwidth(addr, typ, qty, state):
     stats[addr][port][typ][2] += qty
 
 
+def add_statistics_rate(addr, port, typ, clock, qty, state):
+    """Add the given packet to the time series of the bandwidth.
+
+    There is a series for the host, with None as port, and another one for
+    the host and port.
+    """
+    series = state.statistics_rate
+    for key in ((addr, None, typ), (addr, port, typ)):
+        if key not in series:
+            series[key] = RateSeries(state.rate_interval, state.rate_buckets)
+        series[key].add(clock, qty)
+
+
 def obfuscate(text, state):
     """Obfuscate the given text."""
-    return md5((text + state['salt']).encode('utf-8')).hexdigest()
+    return state.obfuscator.obfuscate(text)
 
 
 def get_oid(oid):
@@ -226,17 +222,17 @@ def get_data_packet_name(oid):
 
 def get_topic_name(topic, state):
     """Get the topic name, obfuscating if needed."""
-    return obfuscate(topic, state) if state['obfuscate'] else topic
+    return obfuscate(topic, state) if state.obfuscate else topic
 
 
 def get_type_name(typ, state):
     """get_type_name: Get the type name, obfuscating if needed."""
-    return obfuscate(typ, state) if state['obfuscate'] else typ
+    return obfuscate(typ, state) if state.obfuscate else typ
 
 
 def get_port_number(port, state):
     """Get the port number, obfuscating if needed."""
-    return obfuscate(port, state)[:5] if state['obfuscate'] else port
+    return obfuscate(port, state)[:5] if state.obfuscate else port
 
 
 def get_port_name(port):
@@ -271,36 +267,35 @@ def get_participant(guid, state):
 
     # Check if this is a local participant (we don't know which because we
     # miss the instance ID from the message).
-    if 'local_address' in state and tuple(address) in state['local_address'] \
-            and not state['assign_names']:
+    if tuple(address) in state.local_address \
+            and not state.assign_names:
         return 'local ' + get_port_number(address[1], state)
 
     name = None
-    if state['obfuscate']:
+    if state.obfuscate:
         address[0] = obfuscate(address[0], state)[:15]
         if len(address) > 1:
             address[1] = obfuscate(address[1], state)[:5]
         guid = " ".join(address)
 
         # If obfuscate and assign_names give priority over participants name
-        if state['assign_names']:
+        if state.assign_names:
             name = get_assign_name(guid, state)
 
-    if 'participants' not in state or guid not in state['participants']:
-        name = get_assign_name(guid, state) if state['assign_names'] else guid
+    if guid not in state.participants:
+        name = get_assign_name(guid, state) if state.assign_names else guid
     elif name is None:
-        name = state['participants'][guid]
+        name = state.participants[guid]
 
-    if 'initial_peers' in state:
-        for peer in state['initial_peers']:
-            if name in peer:
-                name += "*"
+    for peer in state.initial_peers:
+        if name in peer:
+            name += "*"
     return name
 
 
 def get_locator(loc, state):
     """Parse the locator and convert to text."""
-    if state['obfuscate'] or state['assign_names']:
+    if state.obfuscate or state.assign_names:
         addr_idx = loc.find("://") + 3
         if addr_idx != len(loc):
             addr = loc[addr_idx:]
@@ -309,7 +304,7 @@ def get_locator(loc, state):
             if port_idx != -1:
                 port = ":" + addr[port_idx + 1:]
                 addr = addr[:port_idx]
-                if state['obfuscate']:
+                if state.obfuscate:
                     port = ":" + obfuscate(port, state)[:5]
             loc = loc[:addr_idx] + get_participant(addr, state) + port
     return loc
@@ -318,20 +313,16 @@ def get_locator(loc, state):
 def get_assign_name(guid, state):
     """Get the assigned name for the entity."""
     guid = " ".join(guid.split())
-    if 'name_table' not in state:
-        state['name_table'] = {}
-    if 'names' not in state:
-        state['names'] = {}
 
-    if guid not in state['names']:
-        names = state['name_table']
+    if guid not in state.names:
+        names = state.name_table
         addr = guid.split()
 
         # Add host part
         if addr[0] not in names:
             names[addr[0]] = {}
-            state['names'][addr[0]] = "H" + str(len(names))
-        name = state['names'][addr[0]]
+            state.names[addr[0]] = "H" + str(len(names))
+        name = state.names[addr[0]]
 
         # Add application part
         if len(addr) >= 2:
@@ -339,8 +330,8 @@ def get_assign_name(guid, state):
             if addr[1] not in names[addr[0]]:
                 names[addr[0]][addr[1]] = []
                 app_name = name + ".A" + str(len(names[addr[0]]))
-                state['names'][app_guid] = app_name
-            name = state['names'][app_guid]
+                state.names[app_guid] = app_name
+            name = state.names[app_guid]
 
         # Add participant part
         if len(addr) >= 3:
@@ -349,21 +340,21 @@ def get_assign_name(guid, state):
                 app_dict.append(addr[2])
             name += ".P" + str(len(app_dict))
 
-        state['names'][guid] = name
-    return state['names'][guid]
+        state.names[guid] = name
+    return state.names[guid]
 
 
 def set_participant(guid, name, state):
     """Set the name of a participant."""
-    if 'participants' not in state:
-        state['participants'] = {}
-    if state['obfuscate']:
+    if state.obfuscate:
         address = guid.split(' ')
         address[0] = obfuscate(address[0], state)[:15]
         address[1] = obfuscate(address[1], state)[:5]
         guid = " ".join(address)
         name = obfuscate(name, state)[:20]
-    state['participants'][guid] = name
+    state.participants[guid] = name
+    # The names of the GUIDs may change.
+    state.guid_names.clear()
 
 
 def set_local_address(guid, state, logger):
@@ -372,18 +363,27 @@ def set_local_address(guid, state, logger):
     local_address = (address[0], address[1])
     # If the local address is already in the list you are most likely
     # writing the output of two different apps in the same file.
-    if 'local_address' not in state:
-        state['local_address'] = set()
-    elif local_address not in state['local_address']:
-        logger.warning("You may have written output from two different apps.")
-    state['local_address'].add(local_address)
-
-    if state['obfuscate']:
+    if local_address not in state.local_address:
+        if state.local_address:
+            logger.warning(
+                "You may have written output from two different apps.")
+        state.local_address.add(local_address)
+        # The names of the GUIDs may change.
+        state.guid_names.clear()
+
+    if state.obfuscate:
         address[0] = obfuscate(address[0], state)[:15]
         address[1] = obfuscate(address[1], state)[:5]
     logger.cfg("Local address: %s %s" % (address[0], address[1]))
 
 
+def set_initial_peers(initial_peers, state):
+    """Set the initial peers."""
+    state.initial_peers = initial_peers
+    # The names of the GUIDs may change.
+    state.guid_names.clear()
+
+
 def get_interface_props(props):
     """Get the interface properties."""
     FLAGS = {
@@ -400,7 +400,7 @@ def get_interface_props(props):
 def get_ip(ip, state, hexadecimal=True, reverse=True):
     """Get the IP address obfuscated if needed."""
     ip = hex2ip(ip, reverse) if hexadecimal else ip
-    return obfuscate(ip, state)[:15] if state['obfuscate'] else ip
+    return obfuscate(ip, state)[:15] if state.obfuscate else ip
 
 
 def hex2ip(host_id, reverse=False):
@@ -416,15 +416,27 @@ def hex2ip(host_id, reverse=False):
 
 
 def parse_guid(state, host_id, app_id, instance_id=None):
-    """Parse the entity GUID field and conver to text."""
-    addr = hex2ip(host_id)
-    app_id = str(int(app_id, 16))
-    guid = addr + " " + app_id.zfill(5)
+    """Parse the entity GUID field and conver to text.
+
+    The names are cached by the hexadecimal fields. The cache is cleared
+    when the participant names, the local addresses or the initial peers
+    change with set_participant, set_local_address or set_initial_peers,
+    or when the state fields are replaced. Changing the content of those
+    fields directly doesn't clear it.
+    """
+    key = (host_id, app_id, instance_id)
+    name = state.guid_names.get(key)
+    if name is not None:
+        return name
 
+    addr = hex2ip(host_id)
+    guid = addr + " " + str(int(app_id, 16)).zfill(5)
     if instance_id:
         guid += " " + str(int(instance_id, 16))
 
-    return get_participant(guid, state)
+    name = get_participant(guid, state)
+    state.guid_names[key] = name
+    return name
 
 
 def parse_sn(seqnum, base=10):
@@ -23,9 +23,13 @@ human-readable format.
 """
 from __future__ import absolute_import, print_function
 from argparse import ArgumentParser
+from glob import glob
 from os.path import exists
 from logparser import __version__
+from logparser.clockdecoder import ClockDecoder
+from logparser.devices.inputdevices import get_compression
 from logparser.logparser import LogParser
+from logparser.rateseries import get_rate_parameters
 
 
 def read_arguments():
@@ -33,14 +37,33 @@ def read_arguments():
     parser = ArgumentParser(description="Convert RTI Connext logs in " +
                             "human-readable format.")
 
-    parser.add_argument("-i", "--input",
-                        help="log file path, by default stdin")
+    parser.add_argument("-i", "--input", nargs='+',
+                        help="log file paths or globs, by default stdin")
+    parser.add_argument("--follow", "-f", action='store_true',
+                        help="keep reading the input file as it grows")
+    parser.add_argument("--checkpoint",
+                        help="resume from and save the state into a file")
+    parser.add_argument("--since", type=ClockDecoder.parse_time,
+                        help="parse only the logs since this time")
+    parser.add_argument("--until", type=ClockDecoder.parse_time,
+                        help="parse only the logs until this time")
+    parser.add_argument("--mmap", action='store_true',
+                        help="memory-map the input file, for very large logs")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of processes to match the input file")
+    parser.add_argument("--pipeline", action='store_true',
+                        help="read, parse and write the logs in threads")
     parser.add_argument("-v", action='count',
                         help="verbosity level - increased by multiple 'v'")
     parser.add_argument("--output", "-o",
                         help="write the output into the specified file")
     parser.add_argument("--overwrite-output", "-oo",
                         help="write the output into a new/truncated file")
+    parser.add_argument("--format", choices=["markdown", "jsonl"],
+                        default="markdown",
+                        help="output format, by default Markdown")
+    parser.add_argument("--sqlite",
+                        help="write the output into a SQLite database")
     parser.add_argument("--write-original",
                         help="write the original log output into a file")
     parser.add_argument("--show-ip", action='store_true',
@@ -49,6 +72,8 @@ def read_arguments():
                         help="hide sensitive information like IP addresses")
     parser.add_argument("--salt", "-s",
                         help="salt for obfuscation - from random if not set")
+    parser.add_argument("--obfuscation-map",
+                        help="load and save the obfuscated names and salt")
     parser.add_argument("--show-timestamp", "-t", action='store_true',
                         help="show timestamp log field")
     parser.add_argument("--show-lines", action='store_true',
@@ -67,6 +92,12 @@ def read_arguments():
                         help="do not show warnigns and errors in network logs")
     parser.add_argument("--no-stats", action='store_true',
                         help="do not show the network and packet statistics")
+    parser.add_argument("--rate-interval", type=float, default=1,
+                        help="seconds of the bandwidth rate intervals")
+    parser.add_argument("--rate-window", type=float, default=3600,
+                        help="seconds of the bandwidth rates to keep")
+    parser.add_argument("--summary-only", action='store_true',
+                        help="do not show the log messages, only the summary")
     parser.add_argument("--no-progress", action='store_true',
                         help="do not show the interative info at the bottom")
 
@@ -75,13 +106,71 @@ def read_arguments():
     parser.add_argument("--version", action='version',
                         help="show the program version",
                         version='%(prog)s ' + __version__)
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.input:
+        args.input = expand_paths(args.input)
+    return args
+
+
+def expand_paths(patterns):
+    """Expand the globs of the input file paths."""
+    paths = []
+    for pattern in patterns:
+        # Keep the patterns without matches to report the missing file.
+        paths.extend(sorted(glob(pattern)) or [pattern])
+    return paths
 
 
 def validate(args):
     """Validate the arguments."""
-    if args.input and not exists(args.input):
-        print("\033[91mERROR: The input file does not exists\033[0m")
+    for path in args.input or []:
+        if not exists(path):
+            print("\033[91mERROR: The input file %s does not exists\033[0m" %
+                  path)
+            return False
+    single_input = args.input is not None and len(args.input) == 1
+    if args.jobs is not None and (args.jobs < 1 or not single_input):
+        print("\033[91mERROR: The --jobs option requires a single input " +
+              "file and a positive number\033[0m")
+        return False
+    if args.pipeline and args.jobs is not None and args.jobs > 1:
+        print("\033[91mERROR: The --pipeline and --jobs options cannot be " +
+              "used together\033[0m")
+        return False
+    if args.mmap and not single_input:
+        print("\033[91mERROR: The --mmap option requires a single input " +
+              "file\033[0m")
+        return False
+    if args.follow and (not single_input or args.mmap or args.jobs):
+        print("\033[91mERROR: The --follow option requires a single input " +
+              "file and it cannot be used with --mmap or --jobs\033[0m")
+        return False
+    if args.checkpoint and (not single_input or args.jobs):
+        print("\033[91mERROR: The --checkpoint option requires a single " +
+              "input file and it cannot be used with --jobs\033[0m")
+        return False
+    time_window = args.since is not None or args.until is not None
+    if time_window and (args.jobs or args.checkpoint):
+        print("\033[91mERROR: The --since and --until options cannot be " +
+              "used with --jobs or --checkpoint\033[0m")
+        return False
+    try:
+        get_rate_parameters(args.rate_interval, args.rate_window)
+    except ValueError as error:
+        print("\033[91mERROR: %s, see --rate-interval and " % error +
+              "--rate-window\033[0m")
+        return False
+    if args.sqlite and args.pipeline:
+        print("\033[91mERROR: The --sqlite and --pipeline options cannot be " +
+              "used together\033[0m")
+        return False
+    if args.follow and get_compression(args.input[0]):
+        print("\033[91mERROR: The --follow option doesn't support " +
+              "compressed files\033[0m")
+        return False
+    if (args.mmap or args.jobs) and get_compression(args.input[0]):
+        print("\033[91mERROR: The --mmap and --jobs options don't support " +
+              "compressed files\033[0m")
         return False
     return True
 
@@ -0,0 +1,71 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the decoder of the log clocks."""
+from __future__ import absolute_import
+import unittest
+
+from logparser.clockdecoder import ClockDecoder
+
+SYSTEM = 1462983921140998
+
+
+class TestClockDecoder(unittest.TestCase):
+    """Tests of the ClockDecoder class."""
+
+    def test_two_clocks(self):
+        """Decode the system and monotonic clocks."""
+        decoder = ClockDecoder()
+        line = "[05/11/2016 16:25:21.140998][0000012345.000100] Log"
+        self.assertEqual(decoder.decode(line), (12345000100, SYSTEM))
+        # The date is cached, so decode it again with other microseconds.
+        line = "[05/11/2016 16:25:21.000001][0000012345.000101] Log"
+        self.assertEqual(decoder.decode(line),
+                         (12345000101, SYSTEM - 140997))
+
+    def test_single_clock(self):
+        """Decode the single clock format as the system clock."""
+        decoder = ClockDecoder()
+        self.assertEqual(decoder.decode("[1462983921.140998] Log"),
+                         (None, SYSTEM))
+        self.assertIsNone(decoder.decode("Log without clocks"))
+        self.assertIsNone(decoder.decode("[D0201|ENABLE] Log"))
+
+    def test_find_clocks(self):
+        """Find the clocks in a raw line."""
+        line = b"Log [1462983921.140998] text"
+        self.assertEqual(ClockDecoder.find_clocks(line, 0, len(line)),
+                         (4, 23))
+        self.assertIsNone(ClockDecoder.find_clocks(line, 5, len(line)))
+
+    def test_isoformat(self):
+        """Convert a system clock into ISO 8601."""
+        decoder = ClockDecoder()
+        self.assertEqual(decoder.get_isoformat(SYSTEM),
+                         "2016-05-11T16:25:21.140998")
+
+    def test_parse_time(self):
+        """Parse the times of the user in several formats."""
+        for text in ("05/11/2016 16:25:21.140998",
+                     "2016-05-11T16:25:21.140998",
+                     "2016-05-11 16:25:21.140998", "1462983921.140998"):
+            self.assertEqual(ClockDecoder.parse_time(text), SYSTEM, text)
+        self.assertEqual(ClockDecoder.parse_time("2016-05-11"),
+                         1462924800000000)
+        self.assertRaises(ValueError, ClockDecoder.parse_time, "yesterday")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the library interface to parse logs into events."""
+from __future__ import absolute_import
+import unittest
+from os.path import dirname, join
+
+from logparser.clockdecoder import ClockDecoder
+from logparser.eventstream import LogEventParser
+
+TUTORIAL_LOG = join(dirname(dirname(__file__)), "tutorial", "logs",
+                    "log1.txt")
+
+
+class TestLogEventParser(unittest.TestCase):
+    """Tests of the LogEventParser class."""
+
+    def _parse(self, **options):
+        """Parse the tutorial log with the options."""
+        parser = LogEventParser(**options)
+        with open(TUTORIAL_LOG) as log:
+            events = list(parser.parse(log))
+        return parser, events
+
+    def test_time_window_text(self):
+        """Parse only the events between the since and until texts."""
+        since = "05/11/2016 16:25:23"
+        until = "2016-05-11T16:25:25"
+        parser, events = self._parse(since=since, until=until)
+        self.assertFalse(list(parser.state.errors.elements()))
+        self.assertTrue(events)
+        for event in events:
+            self.assertGreaterEqual(event.timestamp,
+                                    ClockDecoder.parse_time(since))
+            self.assertLessEqual(event.timestamp,
+                                 ClockDecoder.parse_time(until))
+
+        _, all_events = self._parse()
+        self.assertLess(len(events), len(all_events))
+
+    def test_time_window_clock(self):
+        """Accept the since and until times as system clocks."""
+        since = "05/11/2016 16:25:23"
+        until = "05/11/2016 16:25:25"
+        _, by_text = self._parse(since=since, until=until)
+        _, by_clock = self._parse(since=ClockDecoder.parse_time(since),
+                                  until=ClockDecoder.parse_time(until))
+        self.assertEqual(by_text, by_clock)
+        _, by_unicode = self._parse(since=u"05/11/2016 16:25:23",
+                                    until=u"05/11/2016 16:25:25")
+        self.assertEqual(by_text, by_unicode)
+
+    def test_invalid_time(self):
+        """Reject a time that is not in a known format."""
+        self.assertRaises(ValueError, LogEventParser, since="yesterday")
+
+    def test_invalid_rate_interval(self):
+        """Reject a rate interval shorter than the clock resolution."""
+        self.assertRaises(ValueError, LogEventParser, rate_interval=0)
+        self.assertRaises(ValueError, LogEventParser,
+                          rate_interval=0.0000001)
+        self.assertRaises(ValueError, LogEventParser, rate_interval=2,
+                          rate_window=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the dispatch of the log lines to the regular expressions."""
+from __future__ import absolute_import
+import unittest
+from glob import glob
+from os.path import dirname, join
+
+from logparser.logs.logs import (create_regex_index, create_regex_list,
+                                 get_line_expressions)
+from logparser.state import ParserState
+
+TUTORIAL_LOGS = join(dirname(dirname(__file__)), "tutorial", "logs", "*.txt")
+
+
+def _get_first_match(line, expressions):
+    """Get the first expression that matches the line."""
+    for expr in expressions:
+        match = expr[1].search(line)
+        if match:
+            return expr, match.groups()
+    return None
+
+
+class TestDispatch(unittest.TestCase):
+    """Tests of the index of regular expressions by function name."""
+
+    def setUp(self):
+        """Create the expressions and their index."""
+        state = ParserState()
+        state.debug = True
+        self.expressions = create_regex_list(state)
+        self.index = create_regex_index(self.expressions)
+
+    def _check_line(self, line, cache):
+        """Check that the index matches as the linear scan."""
+        candidates = get_line_expressions(line, self.expressions,
+                                          self.index, cache)
+        self.assertEqual(_get_first_match(line, candidates),
+                         _get_first_match(line, self.expressions), line)
+
+    def test_tutorial_logs(self):
+        """Match the tutorial logs with the index and the linear scan."""
+        cache = {}
+        paths = glob(TUTORIAL_LOGS)
+        self.assertTrue(paths)
+        for path in paths:
+            with open(path) as log:
+                for line in log:
+                    self._check_line(line, cache)
+
+    def test_several_function_names(self):
+        """Match the lines with several indexed function names."""
+        names = [key for key in self.index if key is not None][:3]
+        cache = {}
+        self._check_line(" ".join(name + ":" for name in names), cache)
+        self._check_line(names[1] + ":" + names[0] + ":x", cache)
+
+    def test_keys_in_order(self):
+        """Keep the original order of the expressions in every list."""
+        for expressions in self.index.values():
+            positions = [expr[3] for expr in expressions]
+            self.assertEqual(positions, sorted(positions))
+
+
+if __name__ == "__main__":
+    unittest.main()
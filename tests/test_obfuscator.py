@@ -0,0 +1,68 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the obfuscation of texts."""
+from __future__ import absolute_import
+import unittest
+from os import close, remove
+from tempfile import mkstemp
+
+from logparser.obfuscator import Obfuscator
+
+
+class TestObfuscator(unittest.TestCase):
+    """Tests of the Obfuscator class."""
+
+    def test_salt(self):
+        """Get the same digest only with the same salt."""
+        obfuscator = Obfuscator("salt")
+        digest = obfuscator.obfuscate("192.168.1.1")
+        self.assertEqual(obfuscator.obfuscate("192.168.1.1"), digest)
+        self.assertEqual(Obfuscator("salt").obfuscate("192.168.1.1"), digest)
+        self.assertNotEqual(Obfuscator("other").obfuscate("192.168.1.1"),
+                            digest)
+        self.assertNotEqual(obfuscator.obfuscate("192.168.1.2"), digest)
+
+    def test_cache_size(self):
+        """Keep only the most recently used digests."""
+        obfuscator = Obfuscator("salt", size=2)
+        for text in ("a", "b", "a", "c"):
+            obfuscator.obfuscate(text)
+        self.assertEqual(len(obfuscator), 2)
+
+    def test_map_round_trip(self):
+        """Save the map and load it into a new obfuscator."""
+        obfuscator = Obfuscator("salt")
+        names = [(text, obfuscator.obfuscate(text))
+                 for text in ("host1", "host2", "topic")]
+        handle, path = mkstemp()
+        close(handle)
+        try:
+            obfuscator.save(path)
+            salt, loaded = Obfuscator.load(path)
+        finally:
+            remove(path)
+        self.assertEqual(salt, "salt")
+        self.assertEqual(loaded, names)
+
+        restored = Obfuscator(salt)
+        restored.update(loaded)
+        self.assertEqual(len(restored), len(names))
+        for text, digest in names:
+            self.assertEqual(restored.obfuscate(text), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the statistics of the packets."""
+from __future__ import absolute_import
+import unittest
+
+from logparser.packetstats import INITIAL_PACKET_KINDS, PacketStatistics
+
+
+class TestPacketStatistics(unittest.TestCase):
+    """Tests of the PacketStatistics class."""
+
+    def test_order_of_appearance(self):
+        """List the entities, directions and kinds in order of appearance."""
+        stats = PacketStatistics()
+        self.assertFalse(stats)
+        stats.add("A", 'receive', "DATA")
+        stats.add("B", 'send', "GAP")
+        stats.add("B", 'receive', "HEARTBEAT")
+        stats.add("B", 'receive', "DATA")
+        stats.add("B", 'receive', "DATA")
+        self.assertTrue(stats)
+        self.assertEqual(stats.get_counters(), [
+            ("A", 'receive', 1, [("DATA", 1)]),
+            ("B", 'send', 1, [("GAP", 1)]),
+            ("B", 'receive', 3, [("HEARTBEAT", 1), ("DATA", 2)])])
+
+    def test_many_kinds(self):
+        """Count every kind when there are more than the initial counters."""
+        stats = PacketStatistics()
+        kinds = ["KIND%d" % i for i in range(INITIAL_PACKET_KINDS * 5)]
+        for kind in kinds:
+            stats.add("A", 'send', kind)
+        stats.add("B", 'send', kinds[-1])
+        counters = stats.get_counters()
+        self.assertEqual(counters[0], ("A", 'send', len(kinds),
+                                       [(kind, 1) for kind in kinds]))
+        self.assertEqual(counters[1], ("B", 'send', 1, [(kinds[-1], 1)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the set of integers stored as ranges."""
+from __future__ import absolute_import
+import unittest
+
+from logparser.rangeset import RangeSet
+
+
+def _create(*values):
+    """Create a set with the integers."""
+    ranges = RangeSet()
+    for value in values:
+        ranges.add(value)
+    return ranges
+
+
+class TestRangeSet(unittest.TestCase):
+    """Tests of the RangeSet class."""
+
+    def test_merge(self):
+        """Merge the ranges that overlap or touch."""
+        ranges = _create(1, 2, 3, 7, 5)
+        self.assertEqual(ranges.ranges(), [(1, 4), (5, 6), (7, 8)])
+        ranges.add(6)
+        self.assertEqual(ranges.ranges(), [(1, 4), (5, 8)])
+        ranges.add_range(2, 12)
+        self.assertEqual(ranges.ranges(), [(1, 12)])
+        self.assertEqual(ranges.last(), 11)
+
+    def test_contains(self):
+        """Find the integers in the ranges."""
+        ranges = _create(1, 2, 5)
+        self.assertIn(1, ranges)
+        self.assertIn(5, ranges)
+        self.assertNotIn(0, ranges)
+        self.assertNotIn(3, ranges)
+        self.assertNotIn(6, ranges)
+        self.assertFalse(RangeSet())
+        self.assertIsNone(RangeSet().last())
+
+    def test_split(self):
+        """Split a range when removing integers inside it."""
+        ranges = RangeSet()
+        ranges.add_range(1, 10)
+        self.assertTrue(ranges.discard(5))
+        self.assertFalse(ranges.discard(5))
+        self.assertEqual(ranges.ranges(), [(1, 5), (6, 10)])
+        self.assertEqual(ranges.remove_range(3, 8), [(3, 5), (6, 8)])
+        self.assertEqual(ranges.ranges(), [(1, 3), (8, 10)])
+        self.assertEqual(ranges.remove_range(20, 30), [])
+
+    def test_drop_first(self):
+        """Drop the first ranges without adding the holes between them."""
+        ranges = _create(*range(1, 20, 2))
+        ranges.drop_first(3)
+        self.assertEqual(ranges.ranges(), [(15, 16), (17, 18), (19, 20)])
+        self.assertEqual(ranges.floor, 14)
+        self.assertNotIn(2, ranges)
+        self.assertNotIn(13, ranges)
+        self.assertNotIn(16, ranges)
+
+        ranges.drop_first(3)
+        self.assertEqual(len(ranges.ranges()), 3)
+        self.assertEqual(ranges.floor, 14)
+
+
+if __name__ == "__main__":
+    unittest.main()
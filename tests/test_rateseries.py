@@ -0,0 +1,77 @@
+# Log Parser for RTI Connext.
+#
+#   Copyright 2016 Real-Time Innovations, Inc.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Tests of the time series of the bandwidth."""
+from __future__ import absolute_import
+import unittest
+
+from logparser.rateseries import RateSeries, get_rate_parameters
+
+
+class TestRateSeries(unittest.TestCase):
+    """Tests of the RateSeries class."""
+
+    def test_buckets(self):
+        """Count the packets in the intervals of their clocks."""
+        series = RateSeries(1000, 10)
+        self.assertEqual(series.get_buckets(), [])
+        series.add(1500, 10)
+        series.add(1999, 20)
+        series.add(4000, 5)
+        series.add(500, 1)
+        self.assertEqual(series.get_buckets(), [
+            (0, 1, 1), (1000, 30, 2), (2000, 0, 0), (3000, 0, 0),
+            (4000, 5, 1)])
+
+    def test_max_buckets(self):
+        """Keep only the last intervals and drop the older samples."""
+        series = RateSeries(1000, 4)
+        for second in range(10):
+            series.add(second * 1000, second)
+        series.add(0, 100)
+        self.assertEqual(series.get_buckets(), [
+            (6000, 6, 1), (7000, 7, 1), (8000, 8, 1), (9000, 9, 1)])
+
+    def test_summary_and_bursts(self):
+        """Get the rates per second and the intervals over the average."""
+        series = RateSeries(500000, 100)
+        for bucket in range(10):
+            qty = 1000 if bucket in (3, 4) else 10
+            series.add(bucket * 500000, qty)
+        summary = series.get_summary()
+        self.assertEqual(summary['bytes']['peak'], 2000)
+        self.assertEqual(summary['bytes']['p50'], 20)
+        self.assertEqual(summary['packets']['peak'], 2)
+        self.assertEqual(series.get_bursts(), [(1500000, 2500000, 2000, 2)])
+
+
+class TestRateParameters(unittest.TestCase):
+    """Tests of the get_rate_parameters function."""
+
+    def test_valid(self):
+        """Convert the seconds into microseconds and number of buckets."""
+        self.assertEqual(get_rate_parameters(1, 3600), (1000000, 3600))
+        self.assertEqual(get_rate_parameters(0.1, 1), (100000, 10))
+        self.assertEqual(get_rate_parameters(0.000001, 0.000003), (1, 3))
+
+    def test_invalid(self):
+        """Reject intervals below one microsecond or over the window."""
+        self.assertRaises(ValueError, get_rate_parameters, 0, 1)
+        self.assertRaises(ValueError, get_rate_parameters, 0.0000001, 1)
+        self.assertRaises(ValueError, get_rate_parameters, 2, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()